@@ -337,6 +337,34 @@ DllExport(ULONG) IoAsync(LPVOID hIfc, PWASYNC_PAR sp)
     return Err;
 }
 
+DllExport(ULONG) IoAsyncBatch(LPVOID hIfc, PWASYNC_PAR sp, ULONG count, PULONG chn, PULONG data)
+{
+    ASYNC_PAR t_sp;
+    ULONG Err = L_SUCCESS;
+
+    t_sp.s_Type = sp->s_Type;
+
+    t_sp.FIFO = sp->FIFO;
+    t_sp.IrqStep = sp->IrqStep;
+    t_sp.Pages = sp->Pages;
+
+    t_sp.dRate = sp->dRate;
+    t_sp.Rate = sp->Rate;
+    t_sp.NCh = sp->NCh;
+    for(int i=0;i<128;i++) t_sp.Chn[i] = sp->Chn[i];
+    for(int j=0;j<128;j++) t_sp.Data[j] = sp->Data[j];
+    t_sp.Mode = sp->Mode;
+
+    for(ULONG k=0;k<count;k++)
+    {
+        t_sp.Chn[0] = chn[k];
+        Err = ((IDaqLDevice*)hIfc)->IoAsync(&t_sp);
+        if(Err != L_SUCCESS) break;
+        data[k] = t_sp.Data[0];
+    }
+    return Err;
+}
+
 DllExport(ULONG) GetParameter(LPVOID hIfc, ULONG name, PULONG param)
 {
     return ((IDaqLDevice*)hIfc)->GetParameter(name, param);
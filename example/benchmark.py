@@ -0,0 +1,74 @@
+#! /usr/bin/env python3
+
+"""Сравнение скорости преобразования кодов АЦП в вольты (без оборудования).
+
+baseline - прежняя функция GetDataADC модуля E14-140: маска, вычитание,
+поиск перегрузок, astype и четыре прохода по массиву на каждую порцию с
+повторным расчетом коэффициентов. converter - ConverterADC с заранее
+рассчитанными смещением и масштабом каналов.
+"""
+
+from __future__ import annotations
+
+from timeit import repeat
+from typing import TYPE_CHECKING
+
+from numpy import abs, any, array, empty, float32, int16, where
+from numpy.random import default_rng
+
+from lcomp.device import e140
+from lcomp.ioctl import PLATA_DESCR_U2, WDAQ_PAR
+
+if TYPE_CHECKING:
+    from ctypes import Structure
+
+    from numpy.typing import NDArray
+
+FRAMES = 65536
+NUMBER = 20
+
+
+def baseline(daqpar: Structure, descr: PLATA_DESCR_U2,
+             dataraw: NDArray[int16]) -> NDArray[float32]:
+    """Преобразование по формулам прежней GetDataADC (без хранения остатка кадра)."""
+
+    data14b = dataraw.reshape((daqpar.NCh, -1), order="F") & 0x3FFF
+    data14b[data14b > 8192] -= 16384
+
+    where(any(abs(data14b) > 8000, axis=1))[0].tolist()      # перегруженные каналы
+    data14b = data14b.astype(float32)
+
+    gain = (array(daqpar.Chn) >> 6 & 0x3)[:daqpar.NCh, None]
+    VRange = array([10.0, 2.5, 0.625, 0.15625], dtype=float32)[gain]
+
+    koef = array(descr.t5.KoefADC, dtype=float32)
+    data14b += koef[gain]
+    data14b *= koef[gain + 4]
+    data14b *= VRange
+    data14b /= 8000.0
+    return data14b
+
+
+if __name__ == "__main__":
+    descr = PLATA_DESCR_U2()
+    descr.t5.KoefADC[:] = [0.0, 0.0, 0.0, 0.0, 1.0, 1.0, 1.0, 1.0]        # без калибровки
+
+    for nch in (1, 4, 16, 32):
+        adcpar = WDAQ_PAR()
+        daqpar = adcpar.t3
+        daqpar.NCh = nch
+        daqpar.Chn[:nch] = [ch | (ch % 4) << 6 for ch in range(nch)]      # разные диапазоны
+
+        data = default_rng().integers(-8000, 8000, nch * FRAMES, dtype=int16)
+        out = empty((nch, FRAMES), dtype=float32)
+        converter = e140.ConverterADC(daqpar, descr)
+
+        results = {}
+        for name, func in (("baseline", lambda: baseline(daqpar, descr, data)),
+                           ("converter", lambda: converter(data, out))):
+            results[name] = min(repeat(func, number=NUMBER, repeat=5)) / NUMBER
+
+        print(f"NCh={nch:3d}: baseline {results['baseline'] * 1e3:7.3f} ms, "
+              f"converter {results['converter'] * 1e3:7.3f} ms, "
+              f"{data.size / results['converter'] / 1e6:7.1f} Msamples/s, "
+              f"x{results['baseline'] / results['converter']:.2f}")
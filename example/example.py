@@ -9,6 +9,7 @@ from lcomp.device import e140, e154, e440, e2010, l791
 from lcomp.ioctl import (L_ASYNC, L_DEVICE, L_EVENT, L_PARAM, L_STREAM, L_USER_BASE,
                          WASYNC_PAR, WDAQ_PAR)
 from lcomp.lcomp import LCOMP
+from lcomp.stream import StreamReader
 
 logging.basicConfig(level=logging.INFO)
 
@@ -262,8 +263,8 @@ if __name__ == "__main__":
 
         print("Read data from buffer ...")
 
-        while syncd() < buffer_size:            # ждем, пока заполнится буфер
-            pass
+        daqpar = adcpar.t4 if slpar.BoardType in {L_DEVICE.E2010, L_DEVICE.E2010B, L_DEVICE.L791} else adcpar.t3
+        StreamReader(daqpar, data_ptr, syncd, buffer_size).wait_for(buffer_size)   # ждем, пока заполнится буфер
 
         print("Data ready ...")
 
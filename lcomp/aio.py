@@ -0,0 +1,167 @@
+#! /usr/bin/env python3
+
+"""Асинхронный интерфейс для работы с АЦП/ЦАП фирмы LCARD из asyncio."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent import futures
+from functools import partial
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable
+
+from numpy import concatenate
+
+from lcomp.lcomp import LCOMP
+
+if TYPE_CHECKING:
+    from numpy import float32, int16
+    from numpy.typing import NDArray
+
+    from lcomp.device.converter import Converter
+    from lcomp.stream import StreamReader
+
+
+class AsyncStream:
+    """Асинхронный перебор порций данных кольцевого буфера.
+
+    Буфер читается в отдельном потоке, порции копируются из кольца (и при
+    наличии преобразователя переводятся в вольты) и передаются в цикл
+    событий через очередь ограниченного размера. Если потребитель не
+    успевает, поток чтения ждет освобождения места в очереди.
+    """
+
+    def __init__(self, reader: StreamReader, converter: Converter | None = None,
+                 maxsize: int = 8, interval: float = 0.05) -> None:
+        """Инициализация потока с заданным размером очереди."""
+
+        self._reader = reader
+        self._converter = converter
+        self._maxsize = maxsize
+        self._interval = interval
+        self._queue: asyncio.Queue[Any] | None = None
+        self._thread: threading.Thread | None = None
+        self._halt = threading.Event()
+
+    def _run(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue[Any]) -> None:
+        def put(item: object) -> bool:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            while not self._halt.is_set():
+                try:
+                    future.result(self._interval)
+                    return True
+                except futures.TimeoutError:
+                    continue
+            future.cancel()
+            return False
+
+        try:
+            while not self._halt.is_set() and not self._reader.finished:
+                if not self._reader.wait_for(0, self._interval):
+                    continue
+
+                block = concatenate(self._reader.read())
+                if self._converter is not None:
+                    block = self._converter(block)
+                if not put(block):
+                    return
+            put(None)
+        except Exception as err:
+            put(err)
+
+    def __aiter__(self) -> AsyncIterator[NDArray[int16] | NDArray[float32]]:
+        if self._thread is None:
+            self._queue = asyncio.Queue(self._maxsize)
+            self._thread = threading.Thread(target=self._run, name="lcomp-aio-stream",
+                                            args=(asyncio.get_running_loop(), self._queue),
+                                            daemon=True)
+            self._thread.start()
+        return self
+
+    async def __anext__(self) -> NDArray[int16] | NDArray[float32]:
+        if self._queue is None:
+            raise StopAsyncIteration
+
+        item = await self._queue.get()
+        if item is None:
+            await self.aclose()
+            raise StopAsyncIteration
+        if isinstance(item, Exception):
+            await self.aclose()
+            raise item
+        return item
+
+    async def aclose(self) -> None:
+        """Остановка потока чтения буфера."""
+
+        self._halt.set()
+        if self._thread is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+        self._queue = None
+
+
+class AsyncLCOMP:
+    """Асинхронная обертка над LCOMP.
+
+    Все вызовы драйвера выполняются последовательно в собственном потоке
+    устройства и не блокируют цикл событий. Методы LCOMP доступны под
+    теми же именами как сопрограммы.
+    """
+
+    def __init__(self, slot: int) -> None:
+        """Инициализация обертки для указанного слота."""
+
+        self._slot = slot
+        self._executor = futures.ThreadPoolExecutor(max_workers=1,
+                                                    thread_name_prefix=f"lcomp-{slot}")
+        self.ldev: LCOMP | None = None
+
+    async def _call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+
+    async def __aenter__(self) -> AsyncLCOMP:
+        """Входной блок асинхронного контекстного менеджера."""
+
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type: object, exc_value: object, traceback: object) -> None:
+        """Выходной блок асинхронного контекстного менеджера."""
+
+        await self.close()
+
+    async def open(self) -> bool:
+        """Создание объекта для слота и открытие устройства."""
+
+        self.ldev = await self._call(LCOMP, self._slot)
+        return await self._call(self.ldev.OpenLDevice)
+
+    async def close(self) -> bool:
+        """Завершение работы с устройством."""
+
+        result = await self._call(self.ldev.CloseLDevice)
+        self._executor.shutdown()
+        return result
+
+    async def LoadBios(self, filename: str, marker: int | None = None) -> bool:
+        """Загрузка BIOS в плату."""
+
+        return await self._call(self.ldev.LoadBios, filename, marker)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(self.ldev, name)
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await self._call(method, *args, **kwargs)
+
+        return call
+
+    def stream(self, reader: StreamReader, converter: Converter | None = None,
+               maxsize: int = 8, interval: float = 0.05) -> AsyncStream:
+        """Асинхронный перебор порций данных буфера: async for block in stream."""
+
+        return AsyncStream(reader, converter, maxsize, interval)
+
+
+__all__ = ["AsyncLCOMP", "AsyncStream"]
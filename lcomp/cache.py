@@ -0,0 +1,141 @@
+#! /usr/bin/env python3
+
+"""Кэширование описателей плат (PLATA_DESCR_U2) на локальном диске."""
+
+from __future__ import annotations
+
+import logging
+import os
+from ctypes import Structure, sizeof
+from pathlib import Path
+from typing import ClassVar
+from weakref import WeakKeyDictionary, WeakSet
+
+from lcomp.ioctl import (L_DEVICE, PACKED_PLATA_DESCR_E140, PACKED_PLATA_DESCR_E154, PLATA_DESCR,
+                         PLATA_DESCR_E440, PLATA_DESCR_E2010, PLATA_DESCR_L791, PLATA_DESCR_U2)
+from lcomp.lcomp import LCOMP
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+
+def cache_dir() -> Path:
+    """Каталог кэша: %LOCALAPPDATA%/lcomp, $XDG_CACHE_HOME/lcomp или ~/.cache/lcomp."""
+
+    if os.name == "nt" and (base := os.environ.get("LOCALAPPDATA")):
+        return Path(base) / "lcomp"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "lcomp"
+
+
+# структура описателя во Flash платы по типу L_DEVICE, поля серийного номера
+# и контрольные поля (контрольная сумма, без нее - калибровка АЦП);
+# E14-140 и E154 хранят описатель в упакованном виде
+_FLASH: dict[int, tuple[type[Structure], tuple[str, ...], tuple[str, ...]]] = {
+    L_DEVICE.L791: (PLATA_DESCR_L791, ("SerNum",), ("CRC16",)),
+    L_DEVICE.E440: (PLATA_DESCR_E440, ("SerNum",), ("KoefADC",)),
+    L_DEVICE.E140: (PACKED_PLATA_DESCR_E140, ("SerNum1", "SerNum2", "SerNum3"), ("CRC1", "CRC2")),
+    L_DEVICE.E2010: (PLATA_DESCR_E2010, ("SerNum",), ("CRC",)),
+    L_DEVICE.E2010B: (PLATA_DESCR_E2010, ("SerNum",), ("CRC",)),
+    L_DEVICE.E154: (PACKED_PLATA_DESCR_E154, ("SerNum1", "SerNum2", "SerNum3"), ("CRC1", "CRC2")),
+}
+_DEFAULT = (PLATA_DESCR, ("SerNum",), ("KoefADC",))
+
+
+def _words(layout: type[Structure], fields: tuple[str, ...]) -> list[int]:
+    # адреса слов Flash, занятых полями описателя
+    addresses: set[int] = set()
+    for field in fields:
+        descr = getattr(layout, field)
+        addresses.update(range(descr.offset // 2, (descr.offset + descr.size + 1) // 2))
+    return sorted(addresses)
+
+
+def _read(ldev: LCOMP, addresses: list[int]) -> str:
+    return "".join(f"{ldev.ReadFlashWord(address):04x}" for address in addresses)
+
+
+class DescrCache:
+    """Кэш описателей плат, ключ - тип, серийный номер и контрольные слова платы.
+
+    Положение серийного номера и контрольной суммы берется из структуры,
+    в которой плата хранит описатель во Flash (для E14-140 и E154 -
+    упакованной), эти слова читаются через ReadFlashWord и образуют имя
+    файла записи. Поэтому проверка обходится в несколько чтений слов (на
+    E20-10 - девять), а изменение описателя сторонней программой меняет
+    контрольную сумму и ведет к повторному чтению ReadPlataDescr. Для плат
+    без контрольной суммы вместо нее читаются калибровочные коэффициенты АЦП.
+
+    Перед записью Flash через WritePlataDescr/WriteFlashWord запись платы,
+    прочитанная этим кэшем, удаляется (LCOMP.flash_write_hooks).
+    """
+
+    _instances: ClassVar[WeakSet[DescrCache]] = WeakSet()
+
+    def __init__(self, directory: str | Path | None = None) -> None:
+        """Инициализация кэша в каталоге directory (по умолчанию cache_dir())."""
+
+        self.directory = Path(directory) if directory is not None else cache_dir()
+        self._paths: WeakKeyDictionary[LCOMP, Path] = WeakKeyDictionary()     # записи открытых плат
+
+        DescrCache._instances.add(self)
+        if _forget not in LCOMP.flash_write_hooks:
+            LCOMP.flash_write_hooks.append(_forget)
+
+    @classmethod
+    def key(cls, ldev: LCOMP) -> str:
+        """Имя файла записи для открытой платы."""
+
+        board = ldev.GetSlotParam().BoardType
+        layout, serial, check = _FLASH.get(board, _DEFAULT)
+        return f"{board}-{_read(ldev, _words(layout, serial))}-{_read(ldev, _words(layout, check))}.bin"
+
+    def read(self, ldev: LCOMP) -> PLATA_DESCR_U2:
+        """Описатель платы из кэша или из Flash (с сохранением в кэш)."""
+
+        path = self.directory / self.key(ldev)
+        self._paths[ldev] = path
+        try:
+            data = path.read_bytes()
+            if len(data) == sizeof(PLATA_DESCR_U2):
+                return PLATA_DESCR_U2.from_buffer_copy(data)
+        except OSError:
+            pass
+
+        descr = ldev.ReadPlataDescr()
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._remove(path)          # записи с прежними контрольными словами
+            temp = path.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_bytes(bytes(descr))
+            os.replace(temp, path)
+        except OSError as err:
+            _logger.warning("Descriptor cache write failed (%s)", err)
+
+        return descr
+
+    def _remove(self, path: Path) -> None:
+        board, serial, _ = path.name.split("-")
+        for entry in self.directory.glob(f"{board}-{serial}-*.bin"):
+            entry.unlink(missing_ok=True)
+
+    def invalidate(self, ldev: LCOMP) -> None:
+        """Удаление записей кэша для платы."""
+
+        self._remove(self.directory / self.key(ldev))
+
+    def clear(self) -> None:
+        """Удаление всех записей кэша."""
+
+        for path in self.directory.glob("*.bin"):
+            path.unlink(missing_ok=True)
+
+
+def _forget(ldev: LCOMP) -> None:
+    # обработчик LCOMP.flash_write_hooks: Flash не читается, удаляются только
+    # записи, через которые плата читалась в этом процессе
+    for cache in DescrCache._instances:
+        if (path := cache._paths.pop(ldev, None)) is not None:
+            path.unlink(missing_ok=True)
+
+
+__all__ = ["DescrCache", "cache_dir"]
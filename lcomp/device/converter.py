@@ -0,0 +1,317 @@
+#! /usr/bin/env python3
+
+"""Базовый класс преобразования кодов АЦП в вольты."""
+
+from __future__ import annotations
+
+import logging
+import time
+from ctypes import POINTER, _Pointer, c_ushort, cast
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Sequence
+
+from numpy import (abs, arange, array, asarray, bool_, concatenate, diff, empty, float32,
+                   frombuffer, full, inf, int16, int64, intp, left_shift, multiply, uint32,
+                   unique, zeros)
+
+from lcomp.ioctl import L_ASYNC, L_DEVICE, WASYNC_PAR
+
+if TYPE_CHECKING:
+    from ctypes import Structure
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from lcomp.ioctl import PLATA_DESCR_U2
+    from lcomp.lcomp import LCOMP
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+# модули с описанием плат по типу L_DEVICE
+_MODULES = {L_DEVICE.L791: "l791",
+            L_DEVICE.E440: "e440",
+            L_DEVICE.E140: "e140",
+            L_DEVICE.E2010: "e2010",
+            L_DEVICE.E2010B: "e2010",
+            L_DEVICE.E154: "e154"}
+
+
+def to_array(address: _Pointer[c_ushort], size: int) -> NDArray[int16]:
+    """Представление буфера драйвера в виде массива numpy без копирования."""
+
+    return frombuffer(cast(address, POINTER(c_ushort * size))[0], int16)
+
+
+def _rows(channels: Sequence[int] | None, count: int) -> slice | NDArray[intp]:
+    # равномерная выборка каналов задается срезом и не требует копирования столбцов
+    if channels is None:
+        return slice(None)
+
+    rows = array(channels, dtype=intp).reshape(-1)
+    if not rows.size or rows.min() < 0 or rows.max() >= count:
+        raise ValueError(f"channels must be non-empty and within range({count})")
+
+    steps = unique(diff(rows))
+    if rows.size == 1 or (steps.size == 1 and steps[0] > 0):
+        step = int(steps[0]) if steps.size else 1
+        return slice(int(rows[0]), int(rows[-1]) + 1, step)
+    return rows
+
+
+def _warn_overload(converter: Converter, channels: list[int]) -> None:
+    _logger.warning("Channels %s overload detected", channels)
+
+
+class Converter:
+    """Преобразователь кодов АЦП в вольты для одного потока данных.
+
+    Коэффициенты каналов вычисляются один раз при создании из параметров
+    сбора и описателя платы. Отсчеты неполного кадра в конце порции
+    хранятся в самом объекте и дополняются следующей порцией, поэтому
+    для каждого потока нужен свой экземпляр. Наследники задают параметры
+    АЦП модуля и способ получения усиления и калибровки каналов.
+
+    Код АЦП читается как знаковое число из _bits_ разрядов, поэтому
+    граничный код 0x2000 (0x800 у E154) дает -8192 (-2048). Прежние
+    функции GetDataADC переводили его в +8192 (+2048). Код лежит за
+    порогом перегрузки, и в обоих случаях отсчет считается перегрузкой.
+    """
+
+    _bits_: ClassVar[int] = 14              # разрядность кода АЦП
+    _scale_: ClassVar[float] = 8000.0       # код, соответствующий верхней границе диапазона
+    _overload_: ClassVar[int] = 8000        # порог перегрузки в кодах
+    _ranges_: ClassVar[tuple[float, ...]] = ()      # диапазоны входного напряжения (В)
+
+    _default: ClassVar[tuple[tuple[type, bytes, bytes], Converter] | None] = None
+
+    def __init__(self, daqpar: Structure, descr: PLATA_DESCR_U2,
+                 channels: Sequence[int] | None = None,
+                 on_overload: Callable[[Converter, list[int]], None] | None = _warn_overload,
+                 overload_interval: float = 1.0) -> None:
+        """Расчет смещения и масштаба для каждого канала из Chn.
+
+        channels - номера логических каналов (позиции в Chn), которые нужно
+        преобразовывать, остальные столбцы порции не читаются. Строки
+        результата, offset и scale соответствуют channels в заданном порядке.
+
+        Перегрузки учитываются счетчиками overload_count, overload_first и
+        overload_last (номера кадров от reset) по строкам результата.
+        on_overload вызывается со списком логических каналов не чаще раза в
+        overload_interval секунд, каналы между вызовами накапливаются.
+        """
+
+        gain = self._gain(daqpar)
+        offset, scale = self._koef(descr, gain)
+        scale = scale * array(self._ranges_, dtype=float32)[gain] / float32(self._scale_)
+
+        self._select = _rows(channels, daqpar.NCh)
+        offset, scale = offset[self._select], scale[self._select]
+
+        self.channels: int = daqpar.NCh                                 # отсчетов в кадре
+        self.selected: NDArray[intp] = arange(daqpar.NCh)[self._select]     # строки результата
+        self.offset: NDArray[float32] = offset.astype(float32)      # смещение в кодах
+        self.scale: NDArray[float32] = scale.astype(float32)        # вольт на единицу кода
+        self._bias = (self.offset * self.scale)[:, None]
+        self._factor = self.scale[:, None]
+        self._shift = int16(16 - self._bits_)
+        self._tail = empty(0, dtype=int16)
+
+        self._on_overload = on_overload
+        self._interval = overload_interval
+        self._notified = -inf
+        self._overloaded: set[int] = set()
+        self._frame = 0
+        self.position = 0               # кадров преобразовано с момента reset
+        self.overload_count: NDArray[int64] = zeros(self.selected.size, dtype=int64)
+        self.overload_first: NDArray[int64] = full(self.selected.size, -1, dtype=int64)
+        self.overload_last: NDArray[int64] = full(self.selected.size, -1, dtype=int64)
+
+    def _gain(self, daqpar: Structure) -> NDArray[int16]:
+        """Индексы диапазонов входного напряжения для каналов из Chn."""
+
+        raise NotImplementedError
+
+    def _koef(self, descr: PLATA_DESCR_U2,
+              gain: NDArray[int16]) -> tuple[NDArray[float32], NDArray[float32]]:
+        """Калибровочные смещение и масштаб для каналов из Chn."""
+
+        raise NotImplementedError
+
+    @classmethod
+    def default(cls, daqpar: Structure, descr: PLATA_DESCR_U2) -> Converter:
+        """Общий преобразователь для функции GetDataADC модуля."""
+
+        # ctypes создает новый объект при каждом обращении к полю объединения
+        # (adcpar.t3), поэтому параметры сравниваются по содержимому
+        key = (type(daqpar), bytes(daqpar), bytes(descr))
+        if cls._default is None or cls._default[0] != key:
+            cls._default = (key, cls(daqpar, descr))
+        return cls._default[1]
+
+    def reset(self) -> None:
+        """Сброс отсчетов неполного кадра и счетчиков перегрузки перед новым сбором."""
+
+        self._tail = empty(0, dtype=int16)
+        self.position = 0
+        self.overload_count[:] = 0
+        self.overload_first[:] = -1
+        self.overload_last[:] = -1
+
+    def overloads(self) -> dict[int, tuple[int, int, int]]:
+        """Перегруженные каналы: логический канал -> (отсчетов, первый кадр, последний кадр)."""
+
+        return {int(self.selected[row]): (int(self.overload_count[row]),
+                                          int(self.overload_first[row]),
+                                          int(self.overload_last[row]))
+                for row in self.overload_count.nonzero()[0]}
+
+    def frames(self, count: int) -> int:
+        """Количество полных кадров после добавления count отсчетов."""
+
+        return (self._tail.size + count) // self.channels
+
+    def _check(self, codes: NDArray[int16]) -> None:
+        # сначала минимум и максимум по всей порции в порядке памяти, затем,
+        # если порог превышен, - по каналам, отсчеты считаются только для
+        # перегруженных каналов
+        limit = self._overload_
+        flat = codes.ravel(order="K")
+        if not flat.size or (flat.min() >= -limit and flat.max() <= limit):
+            return
+
+        over_rows = ((codes.min(axis=1) < -limit) | (codes.max(axis=1) > limit)).nonzero()[0]
+        for row in over_rows:
+            self._count(row, abs(codes[row]) > limit)
+
+        if over_rows.size:
+            self._notify(over_rows.tolist())
+
+    def _count(self, row: int, over: NDArray[bool_]) -> None:
+        frames = over.nonzero()[0]
+        self.overload_count[row] += frames.size
+        if self.overload_first[row] < 0:
+            self.overload_first[row] = self._frame + frames[0]
+        self.overload_last[row] = self._frame + frames[-1]
+
+    def _notify(self, rows: list[int]) -> None:
+        self._overloaded.update(self.selected[rows].tolist())
+        if self._on_overload is None:
+            self._overloaded.clear()
+            return
+
+        now = time.monotonic()
+        if now - self._notified >= self._interval:
+            self._notified = now
+            channels = sorted(self._overloaded)
+            self._overloaded.clear()
+            self._on_overload(self, channels)
+
+    def _extend(self, raw: NDArray[int16], out: NDArray[int16]) -> None:
+        left_shift(raw, self._shift, out=out)
+        out >>= self._shift             # знаковое расширение кода АЦП
+        self._check(out)
+
+    def _convert(self, raw: NDArray[int16], out: NDArray[float32]) -> None:
+        codes = raw << self._shift
+        codes >>= self._shift           # знаковое расширение кода АЦП
+        self._check(codes)
+
+        multiply(codes, self._factor, out=out)
+        out += self._bias
+
+    def __call__(self, data: ArrayLike, out: NDArray[float32] | None = None) -> NDArray[float32]:
+        """Преобразование порции чередующихся отсчетов в массив (канал, кадр)."""
+
+        return self._apply(data, out, float32, self._convert)
+
+    def codes(self, data: ArrayLike, out: NDArray[int16] | None = None
+              ) -> tuple[NDArray[int16], NDArray[float32], NDArray[float32]]:
+        """Порция в виде кодов АЦП (канал, кадр) без перевода в вольты.
+
+        Вместе с кодами возвращаются смещение и масштаб каналов, напряжение
+        получается как (codes + offset) * scale. Неполный кадр хранится так
+        же, как при вызове объекта, поэтому режимы нельзя чередовать в
+        одном потоке без reset.
+        """
+
+        return self._apply(data, out, int16, self._extend), self.offset, self.scale
+
+    def _apply(self, data: ArrayLike, out: NDArray[Any] | None, dtype: type,
+               convert: Callable[[NDArray[int16], NDArray[Any]], None]) -> NDArray[Any]:
+        nch, select = self.channels, self._select
+        data = asarray(data).view(int16)
+        frames = self.frames(data.size)
+
+        if out is None:
+            out = empty((self.selected.size, frames), dtype=dtype)
+        out = out[:, :frames]
+
+        head = 0
+        if self._tail.size:
+            if not frames:
+                self._tail = concatenate((self._tail, data))
+                return out
+
+            head = nch - self._tail.size
+            first = concatenate((self._tail, data[:head]))
+            self._frame = self.position
+            convert(first.reshape((nch, 1))[select], out[:, :1])
+
+        body = (data.size - head) // nch
+        columns = data[head:head + body * nch].reshape((body, nch)).T[select]
+        self._frame = self.position + frames - body
+        convert(columns, out[:, frames - body:])
+        self._tail = data[head + body * nch:].copy()
+        self.position += frames
+
+        return out
+
+
+def converter_class(board: int) -> type[Converter]:
+    """Класс преобразователя кодов АЦП для модуля с типом board (L_DEVICE)."""
+
+    if board not in _MODULES:
+        raise ValueError(f"no ADC converter for board type {board}")
+    return import_module(f"lcomp.device.{_MODULES[board]}").ConverterADC
+
+
+class AsyncADC:
+    """Однократный ввод нескольких каналов АЦП (L_ASYNC.ADC_INP).
+
+    Коды всех каналов читаются одним вызовом LCOMP.IoAsyncBatch в
+    постоянный буфер и переводятся в вольты преобразователем модуля.
+    Каналы задаются значениями Chn (номер канала с кодом диапазона) или
+    параметрами сбора daqpar, тогда опрашиваются каналы daqpar.Chn[:NCh].
+    Для E20-10 диапазоны определяются по AdcIMask, поэтому daqpar
+    (WADC_PAR_1) обязателен.
+    """
+
+    def __init__(self, ldev: LCOMP, descr: PLATA_DESCR_U2, channels: Sequence[int] | None = None,
+                 daqpar: Structure | None = None) -> None:
+        """Подготовка запроса и преобразователя для открытого модуля ldev."""
+
+        board = ldev.GetSlotParam().BoardType
+        if daqpar is None:
+            if board in (L_DEVICE.E2010, L_DEVICE.E2010B):
+                raise ValueError("E20-10 input ranges are set by AdcIMask, pass daqpar")
+            if not channels:
+                raise ValueError("channels or daqpar required")
+            daqpar = WASYNC_PAR(NCh=len(channels))
+            daqpar.Chn[:len(channels)] = channels
+
+        self._ldev = ldev
+        self._asp = WASYNC_PAR(s_Type=L_ASYNC.ADC_INP)
+        self._chn = list(daqpar.Chn[:daqpar.NCh])
+        self._data = zeros(len(self._chn), dtype=uint32)
+        self.converter = converter_class(board)(daqpar, descr)
+
+    def __call__(self, out: NDArray[float32] | None = None) -> NDArray[float32]:
+        """Опрос каналов, возвращает напряжения в порядке Chn."""
+
+        self._ldev.IoAsyncBatch(self._asp, self._chn, self._data)
+        if out is not None:
+            out = out.reshape((-1, 1))
+        return self.converter(self._data.astype(int16), out).reshape(-1)
+
+
+__all__ = ["AsyncADC", "Converter", "converter_class", "to_array"]
@@ -4,20 +4,20 @@
 
 from __future__ import annotations
 
-import logging
-from ctypes import POINTER, _Pointer, c_ushort, cast
+from ctypes import _Pointer, c_ushort
 from typing import TYPE_CHECKING
 
-from numpy import abs, any, array, float32, frombuffer, insert, int16, split, where
+from numpy import array, float32, int16
+
+from lcomp.device.converter import Converter, to_array
 
 if TYPE_CHECKING:
+    from ctypes import Structure
+
     from numpy.typing import NDArray
 
     from lcomp.ioctl import PLATA_DESCR_U2, WDAQ_PAR
 
-_logger = logging.getLogger(__name__)
-_logger.addHandler(logging.NullHandler())
-
 
 # диапазон входного напряжения модуля E154
 V5000 = 0              # диапазон 5В
@@ -50,34 +50,25 @@ CH_6 = 6
 CH_7 = 7
 
 
-def GetDataADC(daqpar: WDAQ_PAR, descr: PLATA_DESCR_U2,
-               address: _Pointer[c_ushort], size: int) -> NDArray[float32]:
-    """Преобразование кодов АЦП в вольты."""
-
-    GetDataADC.tail = getattr(GetDataADC, "tail", [])
-
-    arr_ptr = cast(address, POINTER(c_ushort * size))[0]
-
-    dataraw = insert(frombuffer(arr_ptr, int16), 0, GetDataADC.tail)
-    dataraw, GetDataADC.tail = split(dataraw, [dataraw.size - dataraw.size % daqpar.NCh])
-    data12b = dataraw.reshape((daqpar.NCh, -1), order="F") & 0x0FFF
-    data12b[data12b > 2048] -= 4096
+class ConverterADC(Converter):
+    """Преобразователь кодов АЦП модуля E154 в вольты."""
 
-    if over_chn := where(any(abs(data12b) > 2000, axis=1))[0].tolist():
-        _logger.warning("Channels %s overload detected", over_chn)
-    data12b = data12b.astype(float32)
+    _bits_ = 12
+    _scale_ = 2000.0
+    _overload_ = 2000
+    _ranges_ = (5.0, 1.6, 0.5, 0.16)
 
-    gain = (array(daqpar.Chn) >> 6 & 0x3)[:daqpar.NCh, None]
+    def _gain(self, daqpar: Structure) -> NDArray[int16]:
+        return (array(daqpar.Chn[:daqpar.NCh]) >> 6) & 0x3
 
-    VRange = array([5.0, 1.6, 0.5, 0.16], dtype=float32)[gain]
+    def _koef(self, descr: PLATA_DESCR_U2,
+              gain: NDArray[int16]) -> tuple[NDArray[float32], NDArray[float32]]:
+        koef = array(descr.t7.KoefADC, dtype=float32)
+        return koef[gain], koef[gain + 4]           # OffsetCalibration, ScaleCalibration
 
-    koef = array(descr.t7.KoefADC, dtype=float32)
-    A = koef[gain]              # OffsetCalibration
-    B = koef[gain + 4]          # ScaleCalibration
 
-    data12b += A
-    data12b *= B
-    data12b *= VRange
-    data12b /= 2000.0
+def GetDataADC(daqpar: WDAQ_PAR, descr: PLATA_DESCR_U2,
+               address: _Pointer[c_ushort], size: int) -> NDArray[float32]:
+    """Преобразование кодов АЦП в вольты."""
 
-    return data12b
+    return ConverterADC.default(daqpar, descr)(to_array(address, size))
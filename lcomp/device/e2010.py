@@ -4,20 +4,20 @@
 
 from __future__ import annotations
 
-import logging
-from ctypes import POINTER, _Pointer, c_ushort, cast
+from ctypes import _Pointer, c_ushort
 from typing import TYPE_CHECKING
 
-from numpy import abs, any, array, float32, frombuffer, insert, int16, split, where
+from numpy import array, float32, int16, ones, zeros
+
+from lcomp.device.converter import Converter, to_array
 
 if TYPE_CHECKING:
+    from ctypes import Structure
+
     from numpy.typing import NDArray
 
     from lcomp.ioctl import PLATA_DESCR_U2, WDAQ_PAR
 
-_logger = logging.getLogger(__name__)
-_logger.addHandler(logging.NullHandler())
-
 
 # E2010 bit macros for channel input range and mode config, use |/+ operator to configure
 V30_0 = 0x0000      # диапазон 3В для 0 канала
@@ -83,36 +83,25 @@ def _gain_index(mask: int, channel: int) -> int:
            }[channel].get(True, 0)
 
 
-def GetDataADC(daqpar: WDAQ_PAR, descr: PLATA_DESCR_U2,
-               address: _Pointer[c_ushort], size: int) -> NDArray[float32]:
-    """Преобразование кодов АЦП в вольты."""
+class ConverterADC(Converter):
+    """Преобразователь кодов АЦП модуля E20-10 в вольты."""
 
-    GetDataADC.tail = getattr(GetDataADC, "tail", [])
+    _ranges_ = (3.0, 1.0, 0.3)
 
-    arr_ptr = cast(address, POINTER(c_ushort * size))[0]
+    def _gain(self, daqpar: Structure) -> NDArray[int16]:
+        return array([_gain_index(daqpar.AdcIMask, daqpar.Chn[ch]) for ch in range(daqpar.NCh)])
 
-    dataraw = insert(frombuffer(arr_ptr, int16), 0, GetDataADC.tail)
-    dataraw, GetDataADC.tail = split(dataraw, [dataraw.size - dataraw.size % daqpar.NCh])
-    data14b = dataraw.reshape((daqpar.NCh, -1), order="F") & 0x3FFF
-    data14b[data14b > 8192] -= 16384
+    def _koef(self, descr: PLATA_DESCR_U2,
+              gain: NDArray[int16]) -> tuple[NDArray[float32], NDArray[float32]]:
+        if descr.t6.Rev != b"A":
+            return zeros(gain.size, dtype=float32), ones(gain.size, dtype=float32)
 
-    if over_chn := where(any(abs(data14b) > 8000, axis=1))[0].tolist():
-        _logger.warning("Channels %s overload detected", over_chn)
-    data14b = data14b.astype(float32)
-
-    gain = array([_gain_index(daqpar.AdcIMask, daqpar.Chn[ch])
-                  for ch in range(daqpar.NCh)])[:daqpar.NCh, None]
-    VRange = array([3.0, 1.0, 0.3], dtype=float32)[gain]
-
-    if descr.t6.Rev == "A":
         koef = array(descr.t6.KoefADC, dtype=float32)
-        A = koef[gain]                              # OffsetCalibration
-        B = koef[gain + 12]                         # ScaleCalibration
+        return koef[gain], koef[gain + 12]          # OffsetCalibration, ScaleCalibration
 
-        data14b += A
-        data14b *= B
 
-    data14b *= VRange
-    data14b /= 8000.0
+def GetDataADC(daqpar: WDAQ_PAR, descr: PLATA_DESCR_U2,
+               address: _Pointer[c_ushort], size: int) -> NDArray[float32]:
+    """Преобразование кодов АЦП в вольты."""
 
-    return data14b
+    return ConverterADC.default(daqpar, descr)(to_array(address, size))
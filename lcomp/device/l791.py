@@ -4,20 +4,20 @@
 
 from __future__ import annotations
 
-import logging
-from ctypes import POINTER, _Pointer, c_ushort, cast
+from ctypes import _Pointer, c_ushort
 from typing import TYPE_CHECKING
 
-from numpy import abs, any, array, float32, frombuffer, insert, int16, split, where
+from numpy import array, float32, int16
+
+from lcomp.device.converter import Converter, to_array
 
 if TYPE_CHECKING:
+    from ctypes import Structure
+
     from numpy.typing import NDArray
 
     from lcomp.ioctl import PLATA_DESCR_U2, WDAQ_PAR
 
-_logger = logging.getLogger(__name__)
-_logger.addHandler(logging.NullHandler())
-
 
 # диапазон входного напряжения модуля L791
 V10000 = 0              # диапазон 10В
@@ -48,34 +48,24 @@ CH_14 = 14
 CH_15 = 15
 
 
-def GetDataADC(daqpar: WDAQ_PAR, descr: PLATA_DESCR_U2,
-               address: _Pointer[c_ushort], size: int) -> NDArray[float32]:
-    """Преобразование кодов АЦП в вольты."""
-
-    GetDataADC.tail = getattr(GetDataADC, "tail", [])
-
-    arr_ptr = cast(address, POINTER(c_ushort * size))[0]
-
-    dataraw = insert(frombuffer(arr_ptr, int16), 0, GetDataADC.tail)
-    dataraw, GetDataADC.tail = split(dataraw, [dataraw.size - dataraw.size % daqpar.NCh])
-    data14b = dataraw.reshape((daqpar.NCh, -1), order="F") & 0x3FFF
-    data14b[data14b > 8192] -= 16384
+class ConverterADC(Converter):
+    """Преобразователь кодов АЦП модуля L791 в вольты."""
 
-    if over_chn := where(any(abs(data14b) > 8192, axis=1))[0].tolist():
-        _logger.warning("Channels %s overload detected", over_chn)
-    data14b = data14b.astype(float32)
+    _scale_ = 8192.0
+    _overload_ = 8192
+    _ranges_ = (10.0, 5.0, 2.5, 1.25, 0.625, 0.312, 0.156, 0.078)
 
-    gain = (array(daqpar.Chn) >> 6 & 0x7)[:daqpar.NCh, None]
+    def _gain(self, daqpar: Structure) -> NDArray[int16]:
+        return (array(daqpar.Chn[:daqpar.NCh]) >> 6) & 0x7
 
-    VRange = array([10.0, 5.0, 2.5, 1.25, 0.625, 0.312, 0.156, 0.078], dtype=float32)[gain]
+    def _koef(self, descr: PLATA_DESCR_U2,
+              gain: NDArray[int16]) -> tuple[NDArray[float32], NDArray[float32]]:
+        koef = array(descr.t3.KoefADC, dtype=float32)
+        return koef[gain], koef[gain + 8]           # OffsetCalibration, ScaleCalibration
 
-    koef = array(descr.t3.KoefADC, dtype=float32)
-    A = koef[gain]                              # OffsetCalibration
-    B = koef[gain + 8]                          # ScaleCalibration
 
-    data14b += A
-    data14b *= B
-    data14b *= VRange
-    data14b /= 8192.0
+def GetDataADC(daqpar: WDAQ_PAR, descr: PLATA_DESCR_U2,
+               address: _Pointer[c_ushort], size: int) -> NDArray[float32]:
+    """Преобразование кодов АЦП в вольты."""
 
-    return data14b
+    return ConverterADC.default(daqpar, descr)(to_array(address, size))
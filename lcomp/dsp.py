@@ -0,0 +1,128 @@
+#! /usr/bin/env python3
+
+"""Потоковая обработка сигналов: децимация с сохранением состояния между порциями."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Sequence
+
+from numpy import arange, asarray, blackman, empty, float32, matmul, sinc, zeros
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+
+def lowpass(factor: int, taps: int = 16, cutoff: float = 0.9) -> NDArray[float32]:
+    """Коэффициенты ФНЧ (окно Блэкмана) для децимации в factor раз.
+
+    taps - число коэффициентов на одну фазу, cutoff - частота среза в
+    долях от частоты Найквиста после децимации. Усиление на нулевой
+    частоте равно 1.
+    """
+
+    count = factor * taps
+    n = arange(count) - (count - 1) / 2
+    h = sinc(cutoff * n / factor) * blackman(count)
+    return (h / h.sum()).astype(float32)
+
+
+class _Channel:
+    # Входной поток канала разбивается на строки по factor отсчетов, каждая
+    # строка дает один выходной отсчет (в момент последнего отсчета строки):
+    # y[k] = sum(rows[k - l] @ phase[l]), phase[l] - перевернутый l-й кусок h.
+
+    def __init__(self, factor: int, taps: ArrayLike) -> None:
+        h = asarray(taps, dtype=float32)
+        length = -(-h.size // factor)
+        padded = zeros(length * factor, dtype=float32)
+        padded[:h.size] = h
+
+        self.factor = factor
+        self.phases = padded.reshape((length, factor))[:, ::-1].copy()
+        self.history = length - 1       # строк, нужных от предыдущих порций
+        self.work = zeros((self.history + 1, factor), dtype=float32)
+        self.fill = 0                   # отсчетов в неполной строке
+        self.out = empty(0, dtype=float32)
+        self.tmp = empty(0, dtype=float32)
+
+    def _reserve(self, rows: int) -> None:
+        if self.work.shape[0] < self.history + rows + 1:
+            work = zeros((self.history + 2 * rows + 1, self.factor), dtype=float32)
+            work[:self.history + 1] = self.work[:self.history + 1]
+            self.work = work
+        if self.out.size < rows:
+            self.out = empty(2 * rows, dtype=float32)
+            self.tmp = empty(2 * rows, dtype=float32)
+
+    def __call__(self, x: NDArray[float32], out: NDArray[float32] | None) -> NDArray[float32]:
+        factor, history = self.factor, self.history
+        rows = (self.fill + x.size) // factor
+        self._reserve(rows)
+
+        flat = self.work.reshape(-1)
+        start = history * factor + self.fill
+        flat[start:start + x.size] = x
+        self.fill = (self.fill + x.size) % factor
+
+        out = (self.out if out is None else out)[:rows]
+        tmp = self.tmp[:rows]
+        out[:] = 0
+        for lag, phase in enumerate(self.phases):
+            first = history - lag
+            matmul(self.work[first:first + rows], phase, out=tmp)
+            out += tmp
+
+        # строки истории и неполная строка переносятся в начало
+        tail = self.work[rows:rows + history + 1].copy()
+        self.work[:history + 1] = tail
+        return out
+
+
+class Decimator:
+    """Потоковый полифазный КИХ-дециматор для массивов (канал, кадр).
+
+    Порции (например, результат Converter) подаются по очереди, состояние
+    фильтра и неполные группы отсчетов каждого канала сохраняются между
+    вызовами, поэтому результат не зависит от разбиения потока на порции.
+    Коэффициент децимации задается для всех каналов или для каждого
+    отдельно (1 - без децимации). Для каждого выходного отсчета считается
+    только одна свертка длиной taps, буферы выделяются один раз и растут
+    только при увеличении порции.
+    """
+
+    def __init__(self, factors: int | Sequence[int], channels: int | None = None,
+                 taps: Sequence[ArrayLike] | None = None) -> None:
+        """Инициализация коэффициентами децимации и (необязательно) фильтрами каналов."""
+
+        if isinstance(factors, int):
+            factors = [factors] * (channels or 1)
+        if taps is None:
+            taps = [lowpass(factor) if factor > 1 else [1.0] for factor in factors]
+
+        self.factors = list(factors)
+        self._channels = [_Channel(factor, h) for factor, h in zip(self.factors, taps)]
+
+    def reset(self) -> None:
+        """Сброс состояния фильтров перед новым сбором."""
+
+        self._channels = [_Channel(channel.factor, channel.phases[:, ::-1].reshape(-1))
+                          for channel in self._channels]
+
+    def __call__(self, data: ArrayLike,
+                 out: Sequence[NDArray[float32]] | None = None) -> list[NDArray[float32]]:
+        """Децимация порции (канал, кадр).
+
+        Возвращает по массиву на канал (длины различаются при разных
+        коэффициентах). Без out массивы - внутренние буферы, действительные
+        до следующего вызова, иначе результат пишется в начало out[канал].
+        """
+
+        data = asarray(data, dtype=float32)
+        if data.ndim != 2 or data.shape[0] != len(self._channels):
+            raise ValueError(f"expected block of {len(self._channels)} channels, got shape {data.shape}")
+        if out is None:
+            out = [None] * len(self._channels)      # type: ignore[list-item]
+        return [channel(x, y) for channel, x, y in zip(self._channels, data, out)]
+
+
+__all__ = ["Decimator", "lowpass"]
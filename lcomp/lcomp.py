@@ -5,40 +5,111 @@
 from __future__ import annotations
 
 import os
+import time
 from ctypes import (CDLL, CFUNCTYPE, POINTER, Structure, _Pointer, byref, c_char_p,
                     c_int, c_ubyte, c_uint, c_ulonglong, c_ushort, c_void_p, cast,
-                    pointer)
-from functools import partial
-from pathlib import Path
-from platform import architecture
-from typing import TYPE_CHECKING, Callable
+                    pointer, sizeof)
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, Sequence
+from zlib import crc32
 
-from lcomp.ioctl import (L_ERROR, L_EVENT, L_STREAM, PLATA_DESCR_U2, SLOT_PAR,
-                         WADC_PAR_0, WADC_PAR_1, WASYNC_PAR, WDAC_PAR_0, WDAC_PAR_1)
+from lcomp.ioctl import (L_DEVICE, L_ERROR, L_EVENT, L_STREAM, L_USER_BASE, PLATA_DESCR_U2,
+                         SLOT_PAR, WADC_PAR_0, WADC_PAR_1, WASYNC_PAR, WDAC_PAR_0, WDAC_PAR_1)
 
 if TYPE_CHECKING:
-    from _ctypes import _CData, _PyCFuncPtrType
+    from ctypes import Array
+
+    from _ctypes import _CData
+
+_DIRECTORY = os.path.dirname(__file__)
+
+_wlib_name, _lib_name, _ifc_type = {    # type: ignore
+    "posix": {4: ("libwlcomp.so", "liblcomp.so", c_void_p),
+              8: ("libwlcomp.so", "liblcomp.so", c_void_p)},
+    "nt": {4: ("wlcomp.dll", "lcomp.dll", lambda x: pointer(c_uint(x))),
+           8: ("wlcomp64.dll", "lcomp64.dll", lambda x: pointer(c_ulonglong(x)))},
+}[os.name][sizeof(c_void_p)]
+
+# библиотеки (или модель Simulator) загружаются при первом обращении к устройству
+_wlib: Any = None
+_lib: Any = None
+_load_lock = Lock()
 
 
 def _load_lib(name: str) -> CDLL:
-    return CDLL(str(Path(__file__).parent / "libs" / name))
+    return CDLL(os.path.join(_DIRECTORY, "libs", name))
 
 
-_wlib_name, _lib_name, _ifc_type = {    # type: ignore
-    "posix": {"32bit": ("libwlcomp.so", "liblcomp.so", c_void_p),
-              "64bit": ("libwlcomp.so", "liblcomp.so", c_void_p)},
-    "nt": {"32bit": ("wlcomp.dll", "lcomp.dll", lambda x: pointer(c_uint(x))),
-           "64bit": ("wlcomp64.dll", "lcomp64.dll", lambda x: pointer(c_ulonglong(x)))},
-}[os.name][architecture()[0]]
+def _libraries() -> tuple[Any, Any]:
+    """Однократная загрузка wlcomp и lcomp (или модели при LCOMP_SIMULATOR)."""
+
+    global _wlib, _lib, _ifc_type
+
+    if _wlib is None:
+        with _load_lock:
+            if _wlib is None:
+                if boards := os.environ.get("LCOMP_SIMULATOR"):
+                    from lcomp.simulator import Simulator
+
+                    wlib = lib = Simulator.from_string(boards)
+                    _ifc_type = c_void_p
+                else:
+                    wlib = _load_lib(_wlib_name)
+                    lib = _load_lib(_lib_name)
+                _lib, _wlib = lib, wlib        # _wlib присваивается последним
 
-_wlib = _load_lib(_wlib_name)
-_lib = _load_lib(_lib_name)
+    return _wlib, _lib
+
+
+# платы, у которых PlataTest - заглушка и не подтверждает загруженный BIOS
+_STUB_TEST = {L_DEVICE.E140, L_DEVICE.E154, L_DEVICE.E2010, L_DEVICE.E2010B, L_DEVICE.L791}
+
+
+def _bios_crc(biospath: str) -> int:
+    # драйвер сам добавляет расширение (.bio или .pld), ищется такой же файл
+    for extension in (".bio", ".pld"):
+        if os.path.isfile(biospath + extension):
+            with open(biospath + extension, "rb") as file:
+                return crc32(file.read()) or 1
+    return 0
 
 
 class LcompError(Exception):
     pass
 
 
+class _StreamSync:
+    """Счетчик sync потока, возвращаемый SetParametersStream.
+
+    Вызов возвращает текущее значение sync. LCOMP отмечает время запуска и
+    остановки сбора, по которым running дает время работы платы между
+    опросами, чтобы паузы после StopLDevice не принимались за обороты кольца.
+    """
+
+    def __init__(self, address: _Pointer[c_uint]) -> None:
+        self._address = address
+        self.started: float | None = None       # время последнего запуска сбора
+        self.stopped: float | None = None       # время остановки (None - сбор идет)
+
+    def __call__(self) -> int:
+        return self._address.contents.value
+
+    def start(self) -> None:
+        self.started, self.stopped = time.perf_counter(), None
+
+    def stop(self) -> None:
+        if self.started is not None and self.stopped is None:
+            self.stopped = time.perf_counter()
+
+    def running(self, since: float, now: float) -> float:
+        """Время (с), в течение которого сбор был запущен на отрезке [since, now]."""
+
+        if self.started is None:
+            return 0.0
+        end = now if self.stopped is None else min(now, self.stopped)
+        return max(end - max(since, self.started), 0.0)
+
+
 class IDaqLDevice(c_void_p):
     """Основной интерфейс для работы с устройствами."""
 
@@ -63,6 +134,7 @@ class IDaqLDevice(c_void_p):
         "inmword": CFUNCTYPE(c_uint, c_void_p, c_uint, POINTER(c_ushort), c_uint, c_uint),
         "inword": CFUNCTYPE(c_uint, c_void_p, c_uint, POINTER(c_ushort), c_uint, c_uint),
         "IoAsync": CFUNCTYPE(c_uint, c_void_p, POINTER(WASYNC_PAR)),
+        "IoAsyncBatch": CFUNCTYPE(c_uint, c_void_p, POINTER(WASYNC_PAR), c_uint, POINTER(c_uint), POINTER(c_uint)),
         "LoadBios": CFUNCTYPE(c_uint, c_void_p, c_char_p),
         "OpenLDevice": CFUNCTYPE(c_int, c_void_p),
         "outbyte": CFUNCTYPE(c_uint, c_void_p, c_uint, POINTER(c_ubyte), c_uint, c_uint),
@@ -95,23 +167,40 @@ class IDaqLDevice(c_void_p):
         "StopLDeviceEx": CFUNCTYPE(c_uint, c_void_p, c_uint),
     }
 
-    def __call__(self, prototype: _PyCFuncPtrType, *arguments: tuple[_CData, ...]) -> int:
-        result: int = prototype((self.name, _wlib))(*arguments)
+    _unchecked_ = frozenset({"CallCreateInstance", "OpenLDevice", "Get_LDEV2_Interface"})
 
-        special_names = {"CallCreateInstance", "OpenLDevice", "Get_LDEV2_Interface"}
-        if result and self.name not in special_names:
-            raise LcompError(L_ERROR(result).name)
+    @classmethod
+    def _bind(cls, name: str) -> Callable[..., int]:
+        """Однократное получение функции из библиотеки с проверкой результата."""
 
-        return result
+        prototype = cls._functions_[name]
+        wlib, _ = _libraries()
+        if isinstance(wlib, CDLL):
+            function = prototype((name, wlib))
+        else:
+            function = prototype(getattr(wlib, name))
+        if name in cls._unchecked_:
+            return function
+
+        def checked(*arguments: _CData) -> int:
+            if result := function(*arguments):
+                raise LcompError(L_ERROR(result).name)
+            return result
+
+        return checked
 
     def __getattr__(self, name: str) -> Callable[..., int]:    # type: ignore
-        self.name = name
-        return partial(self.__call__, self._functions_[name])
+        function = self._bind(name)
+        setattr(IDaqLDevice, name, staticmethod(function))   # последующие вызовы минуют __getattr__
+        return function
 
 
 class LCOMP:
     """Python wrapper for lcomp library."""
 
+    # функции, вызываемые с объектом LCOMP перед WritePlataDescr/WriteFlashWord
+    flash_write_hooks: ClassVar[list[Callable[[LCOMP], None]]] = []
+
     def __init__(self, slot: int) -> None:
         """Инициализация класса клиента с указанными параметрами."""
 
@@ -123,6 +212,12 @@ class LCOMP:
                          WADC_PAR_0: c_uint(2),
                          WADC_PAR_1: c_uint(3)}
 
+        self._pool: dict[type, Any] = {}    # буферы ввода массивов по типу элемента
+        self._syncs: dict[int, _StreamSync] = {}    # счетчики sync по типу потока
+
+        self.bios_time = 0.0        # длительность последнего вызова LoadBios, с
+        self.bios_loaded = False    # выполнялась ли загрузка в последнем вызове
+
         self._ldev = IDaqLDevice()
         self.CreateInstance(slot)
 
@@ -141,7 +236,8 @@ class LCOMP:
         """Функция создает объект для конкретного слота."""
 
         err = c_uint()
-        hdll = _ifc_type(_lib._handle)
+        _, lib = _libraries()
+        hdll = _ifc_type(lib._handle)
 
         if result := self._ldev.CallCreateInstance(hdll, c_uint(slot), byref(err)):
             self._ifc = _ifc_type(result)
@@ -166,16 +262,53 @@ class LCOMP:
 
         return not self._ldev.CloseLDevice(self._ifc)
 
-    def LoadBios(self, filename: str) -> bool:
+    def LoadBios(self, filename: str, marker: int | None = None) -> bool:
         """Загрузка BIOS в плату. В модуль E20-10 загружается прошивка ПЛИС
         e2010.pld, указывать ее нужно также без расширения. У L791 нет
         загружаемого БИОСа. E140 также не требует загрузки БИОС.
+
+        marker - адрес пользовательского параметра (L_USER_BASE..
+        L_USER_BASE + 127), который отводится под CRC32 загруженного файла.
+        Если он задан, загрузка пропускается, когда в параметре записана
+        CRC32 того же файла и PlataTest подтверждает работающий BIOS, а после
+        загрузки CRC32 записывается в параметр. Прочитать версию прошивки
+        обратно драйвер не позволяет, поэтому marker допускается только для
+        плат с настоящим PlataTest (E14-440, L-7xx): на E20-10 PlataTest -
+        заглушка, и устаревший параметр мог бы оставить ПЛИС незагруженной.
+        Пропуск возможен, только если драйвер сохраняет пользовательские
+        параметры между сеансами работы с платой, иначе загрузка выполняется
+        каждый раз. Длительность вызова сохраняется в bios_time, факт
+        загрузки - в bios_loaded.
         """
 
-        biospath = str(Path(__file__).parent / "bios" / filename)
-        bios = c_char_p(biospath.encode("ascii"))
+        if marker is not None:
+            if not L_USER_BASE <= marker < L_USER_BASE + 128:
+                raise ValueError("marker must be a user parameter address")
+            if self.GetSlotParam().BoardType in _STUB_TEST:
+                raise ValueError("marker requires a board whose PlataTest verifies the BIOS")
+
+        started = time.perf_counter()
+        biospath = os.path.join(_DIRECTORY, "bios", filename)
+        crc = _bios_crc(biospath) if marker is not None else 0
+
+        self.bios_loaded = marker is None or not crc or not self._bios_present(marker, crc)
+        if self.bios_loaded:
+            bios = c_char_p(biospath.encode("ascii"))
+            self._ldev.LoadBios(self._ifc, bios)
+            if marker is not None and crc:
+                try:
+                    self.SetParameter(marker, crc)
+                except LcompError:
+                    pass
+
+        self.bios_time = time.perf_counter() - started
+        return True
 
-        return not self._ldev.LoadBios(self._ifc, bios)
+    def _bios_present(self, marker: int, crc: int) -> bool:
+        try:
+            return self.GetParameter(marker) == crc and self.PlataTest()
+        except LcompError:
+            return False
 
     def PlataTest(self) -> bool:
         """Тест на наличие платы и успешную загрузку. Для L791, E14-140 E154 и
@@ -203,6 +336,8 @@ class LCOMP:
     def WritePlataDescr(self, descr: PLATA_DESCR_U2, enable: bool) -> bool:
         """Запись пользовательского Flash."""
 
+        for hook in LCOMP.flash_write_hooks:
+            hook(self)
         return not self._ldev.WritePlataDescr(self._ifc, byref(descr), c_ushort(enable))
 
     def ReadFlashWord(self, address: int) -> int:
@@ -216,6 +351,8 @@ class LCOMP:
     def WriteFlashWord(self, address: int, value: int) -> bool:
         """Запись слова в пользовательский Flash."""
 
+        for hook in LCOMP.flash_write_hooks:
+            hook(self)
         return not self._ldev.WriteFlashWord(self._ifc, c_ushort(address), c_ushort(value))
 
     def RequestBufferStream(self, size: int, stream_id: L_STREAM) -> int:
@@ -245,9 +382,10 @@ class LCOMP:
                                        byref(c_uint(size)), data, sync,
                                        self._stream_id)
         data_ptr = cast(data.contents, POINTER(c_ushort))
-        sync_val = cast(sync.contents, POINTER(c_uint))
+        sync_val = _StreamSync(cast(sync.contents, POINTER(c_uint)))
+        self._syncs[self._stream_id.value] = sync_val
 
-        return data_ptr, lambda: sync_val.contents.value
+        return data_ptr, sync_val
 
     def InitStartLDevice(self) -> bool:
         """Инициализация внутренних переменных драйвера перед началом сбора."""
@@ -257,12 +395,17 @@ class LCOMP:
     def StartLDevice(self) -> bool:
         """Запуск сбора данных с платы в большой кольцевой буфер."""
 
+        for sync in self._syncs.values():
+            sync.start()
         return not self._ldev.StartLDevice(self._ifc)
 
     def StopLDevice(self) -> bool:
         """Остановка сбора данных с платы в большой кольцевой буфер."""
 
-        return not self._ldev.StopLDevice(self._ifc)
+        result = not self._ldev.StopLDevice(self._ifc)
+        for sync in self._syncs.values():
+            sync.stop()
+        return result
 
     def EnableCorrection(self, enable: bool) -> bool:
         """Включает/выключает режим коррекции данных."""
@@ -276,6 +419,33 @@ class LCOMP:
 
         return not self._ldev.IoAsync(self._ifc, byref(daqpar))
 
+    def IoAsyncBatch(self, daqpar: WASYNC_PAR, channels: Sequence[int],
+                     data: Any = None) -> Array[c_uint]:
+        """Последовательные вызовы IoAsync для каждого из channels (номер
+        подставляется в Chn[0]) за один переход в библиотеку, Data[0] каждого
+        вызова записывается в массив результатов. daqpar не изменяется.
+        data - буфер для результатов (не меньше len(channels) элементов
+        ULONG), по умолчанию создается новый массив. Если библиотека не
+        содержит IoAsyncBatch, вызовы выполняются в цикле.
+        """
+
+        count = len(channels)
+        result = (c_uint * count)() if data is None else (c_uint * count).from_buffer(data)
+        chn = (c_uint * count)(*channels)
+
+        try:
+            function = self._ldev.IoAsyncBatch
+        except AttributeError:
+            asp = WASYNC_PAR.from_buffer_copy(daqpar)
+            for index, channel in enumerate(chn):
+                asp.Chn[0] = channel
+                self._ldev.IoAsync(self._ifc, byref(asp))
+                result[index] = asp.Data[0]
+        else:
+            function(self._ifc, byref(daqpar), c_uint(count), chn, result)
+
+        return result
+
     def GetParameter(self, address: int) -> int:
         """Функция возвращает некоторые полезные данные о модуле и позволяет
         вместе с SetParameter хранить временно данные пользователя.
@@ -329,18 +499,18 @@ class LCOMP:
     def GetArray_DM(self, address: int, count: int) -> tuple[int, ...]:
         """Читает массив слов из памяти данных DSP."""
 
-        data = pointer(c_ushort())
+        data = (c_ushort * count)()
 
         self._ldev.GetArray_DM(self._ifc, c_ushort(address), c_uint(count), data)
-        return tuple(data[:count])
+        return tuple(data)
 
     def GetArray_PM(self, address: int, count: int) -> tuple[int, ...]:
         """Читает массив слов из памяти программ DSP."""
 
-        data = pointer(c_uint())
+        data = (c_uint * count)()
 
         self._ldev.GetArray_PM(self._ifc, c_ushort(address), c_uint(count), data)
-        return tuple(data[:count])
+        return tuple(data)
 
     def PutWord_DM(self, address: int, data: int) -> bool:
         """Записывает слово в память данных DSP/модуля."""
@@ -456,6 +626,106 @@ class LCOMP:
         return not self._ldev.outmdword(self._ifc, c_uint(offset), byref(c_uint(data)),
                                         c_uint(length), c_uint(key))
 
+# Ввод/вывод массивов через буферный протокол
+
+    def _array(self, ctype: type, count: int) -> Any:
+        # общий массив numpy для ввода без буфера вызывающего, растет по мере необходимости
+        buffer = self._pool.get(ctype)
+        if buffer is None or buffer.size < count:
+            from numpy import empty, uint8, uint16, uint32
+
+            dtype = {c_ubyte: uint8, c_ushort: uint16, c_uint: uint32}[ctype]
+            buffer = self._pool[ctype] = empty(count, dtype=dtype)
+        return buffer[:count]
+
+    def _in_array(self, name: str, ctype: type, offset: int, count: int, data: Any,
+                  key: int) -> Any:
+        if data is None:
+            data = self._array(ctype, count)
+        buffer = (ctype * count).from_buffer(data)
+
+        getattr(self._ldev, name)(self._ifc, c_uint(offset), buffer,
+                                  c_uint(count * sizeof(ctype)), c_uint(key))
+        return data
+
+    def _out_array(self, name: str, ctype: type, offset: int, data: Any, key: int) -> bool:
+        view = memoryview(data)
+        count = view.nbytes // sizeof(ctype)
+        buffer = (ctype * count).from_buffer_copy(view) if view.readonly else \
+            (ctype * count).from_buffer(data)
+
+        return not getattr(self._ldev, name)(self._ifc, c_uint(offset), buffer,
+                                             c_uint(count * sizeof(ctype)), c_uint(key))
+
+    def inbyte_array(self, offset: int, count: int, data: Any = None, key: int = 0) -> Any:
+        """Ввод count байт из I/O порта.
+
+        Результат записывается в data (любой изменяемый буфер не меньше
+        count элементов, например массив numpy), без data - в общий массив
+        numpy объекта, действительный до следующего ввода того же типа.
+        """
+
+        return self._in_array("inbyte", c_ubyte, offset, count, data, key)
+
+    def inword_array(self, offset: int, count: int, data: Any = None, key: int = 0) -> Any:
+        """Ввод count слов из I/O порта (см. inbyte_array)."""
+
+        return self._in_array("inword", c_ushort, offset, count, data, key)
+
+    def indword_array(self, offset: int, count: int, data: Any = None, key: int = 0) -> Any:
+        """Ввод count двойных слов из I/O порта (см. inbyte_array)."""
+
+        return self._in_array("indword", c_uint, offset, count, data, key)
+
+    def inmbyte_array(self, offset: int, count: int, data: Any = None, key: int = 0) -> Any:
+        """Ввод count байт из памяти (см. inbyte_array)."""
+
+        return self._in_array("inmbyte", c_ubyte, offset, count, data, key)
+
+    def inmword_array(self, offset: int, count: int, data: Any = None, key: int = 0) -> Any:
+        """Ввод count слов из памяти (см. inbyte_array)."""
+
+        return self._in_array("inmword", c_ushort, offset, count, data, key)
+
+    def inmdword_array(self, offset: int, count: int, data: Any = None, key: int = 0) -> Any:
+        """Ввод count двойных слов из памяти (см. inbyte_array)."""
+
+        return self._in_array("inmdword", c_uint, offset, count, data, key)
+
+    def outbyte_array(self, offset: int, data: Any, key: int = 0) -> bool:
+        """Вывод массива байт в I/O порт.
+
+        data - любой объект с буферным протоколом (массив numpy, bytes,
+        array.array), длина берется из размера буфера.
+        """
+
+        return self._out_array("outbyte", c_ubyte, offset, data, key)
+
+    def outword_array(self, offset: int, data: Any, key: int = 0) -> bool:
+        """Вывод массива слов в I/O порт (см. outbyte_array)."""
+
+        return self._out_array("outword", c_ushort, offset, data, key)
+
+    def outdword_array(self, offset: int, data: Any, key: int = 0) -> bool:
+        """Вывод массива двойных слов в I/O порт (см. outbyte_array)."""
+
+        return self._out_array("outdword", c_uint, offset, data, key)
+
+    def outmbyte_array(self, offset: int, data: Any, key: int = 0) -> bool:
+        """Вывод массива байт в память (см. outbyte_array)."""
+
+        return self._out_array("outmbyte", c_ubyte, offset, data, key)
+
+    def outmword_array(self, offset: int, data: Any, key: int = 0) -> bool:
+        """Вывод массива слов в память (см. outbyte_array)."""
+
+        return self._out_array("outmword", c_ushort, offset, data, key)
+
+    def outmdword_array(self, offset: int, data: Any, key: int = 0) -> bool:
+        """Вывод массива двойных слов в память (см. outbyte_array)."""
+
+        return self._out_array("outmdword", c_uint, offset, data, key)
+
 # Расширенный интерфейс для работы с устройствами
 
     def Get_LDEV2_Interface(self) -> bool:
@@ -482,12 +752,17 @@ class LCOMP:
     def StartLDeviceEx(self, stream_id: L_STREAM) -> bool:
         """Функция запускает сбор данных с платы в большой кольцевой буфер."""
 
+        if sync := self._syncs.get(stream_id):
+            sync.start()
         return not self._ldev.StartLDeviceEx(self._ifc2, c_uint(stream_id))
 
     def StopLDeviceEx(self, stream_id: L_STREAM) -> bool:
         """Функция останавливает сбор данных с платы в большой кольцевой буфер."""
 
-        return not self._ldev.StopLDeviceEx(self._ifc2, c_uint(stream_id))
+        result = not self._ldev.StopLDeviceEx(self._ifc2, c_uint(stream_id))
+        if sync := self._syncs.get(stream_id):
+            sync.stop()
+        return result
 
 
 __all__ = ["LCOMP"]
@@ -0,0 +1,214 @@
+#! /usr/bin/env python3
+
+"""Управление несколькими модулями LCARD в одном процессе."""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Iterable
+
+from lcomp.ioctl import L_DEVICE, L_PARAM, L_STREAM, WDAQ_PAR
+from lcomp.lcomp import LCOMP
+from lcomp.stream import StreamReader, sample_rate
+from lcomp.worker import L_OVERRUN, AcquisitionWorker
+
+if TYPE_CHECKING:
+    from ctypes import Structure
+
+    from lcomp.cache import DescrCache
+    from lcomp.ioctl import PLATA_DESCR_U2
+
+
+# модули, параметры АЦП которых задаются структурой WADC_PAR_1
+_ADC_PAR_1 = {L_DEVICE.E2010, L_DEVICE.E2010B, L_DEVICE.L791}
+
+
+@dataclass
+class DeviceSpec:
+    """Описание конфигурации одного модуля.
+
+    adc - значения полей WADC_PAR_0/WADC_PAR_1 (структура выбирается по
+    типу модуля), Chn задается списком. Поля s_Type, IrqEna и AdcEna
+    заполняются автоматически, если не указаны.
+    """
+
+    slot: int
+    adc: dict[str, Any]
+    bios: str | None = None
+    bios_marker: int | None = None          # параметр для пропуска повторной загрузки BIOS (E14-440)
+    buffer_size: int = 131072
+    block_size: int | None = None           # по умолчанию IrqStep
+    capacity: int = 16
+    policy: L_OVERRUN = L_OVERRUN.BLOCK
+    correction: bool = True
+
+
+@dataclass
+class Device:
+    """Открытый и настроенный модуль."""
+
+    spec: DeviceSpec
+    ldev: LCOMP
+    board: int
+    descr: PLATA_DESCR_U2
+    daqpar: Structure
+    reader: StreamReader
+    worker: AcquisitionWorker
+    started: float = 0.0
+
+
+class DeviceManager:
+    """Одновременная работа с несколькими модулями.
+
+    Открытие, загрузка BIOS и настройка модулей выполняются параллельно в
+    пуле потоков, запуск сбора - подряд без пауз для минимального
+    расхождения по времени. Кольцевой буфер каждого модуля обслуживается
+    своим AcquisitionWorker, порции доступны через devices[slot].worker.
+    При заданном cache описатели плат читаются через DescrCache.
+
+    Поток на модуль выбран вместо общего планировщика намеренно. Поток
+    почти все время ждет данных (событие драйвера или пауза до заполнения
+    IrqStep) и не держит GIL, копирование кольца и вызовы драйвера GIL
+    также отпускают, поэтому число активных потоков не больше числа
+    модулей, занятых копированием. Общий планировщик при политике BLOCK
+    останавливался бы на заполненной очереди одного модуля, и кольца
+    остальных переполнялись бы; ожидание события драйвера тоже возможно
+    только для одного модуля в потоке. Число потоков ограничено числом
+    модулей.
+    """
+
+    def __init__(self, specs: Iterable[DeviceSpec], workers: int | None = None,
+                 cache: DescrCache | None = None) -> None:
+        """Инициализация менеджера списком конфигураций модулей."""
+
+        self._specs = list(specs)
+        self._cache = cache
+        self._workers = workers or len(self._specs) or 1
+        self._started = 0.0
+        self.devices: dict[int, Device] = {}
+
+    def __enter__(self) -> DeviceManager:
+        """Входной блок контекстного менеджера."""
+
+        self.open()
+        return self
+
+    def __exit__(self, exc_type: object, exc_value: object, traceback: object) -> None:
+        """Выходной блок контекстного менеджера."""
+
+        self.close()
+
+    def _configure(self, spec: DeviceSpec) -> Device:
+        ldev = LCOMP(spec.slot)
+        ldev.OpenLDevice()
+        try:
+            if spec.bios:
+                ldev.LoadBios(spec.bios, spec.bios_marker)
+            ldev.PlataTest()
+
+            board = ldev.GetSlotParam().BoardType
+            descr = self._cache.read(ldev) if self._cache else ldev.ReadPlataDescr()
+            size = ldev.RequestBufferStream(spec.buffer_size, L_STREAM.ADC)
+
+            adcpar = WDAQ_PAR()
+            daqpar = adcpar.t4 if board in _ADC_PAR_1 else adcpar.t3
+            values = {"s_Type": L_PARAM.ADC, "IrqEna": 1, "AdcEna": 1, **spec.adc}
+            for name, value in values.items():
+                if name == "Chn":
+                    daqpar.Chn[:len(value)] = value
+                else:
+                    setattr(daqpar, name, value)
+
+            ldev.FillDAQparameters(daqpar)
+            data_ptr, syncd = ldev.SetParametersStream(daqpar, size)
+            ldev.EnableCorrection(spec.correction)
+
+            reader = StreamReader(daqpar, data_ptr, syncd, size, aligned=True)
+            worker = AcquisitionWorker(reader, spec.block_size or daqpar.IrqStep,
+                                       spec.capacity, spec.policy)
+            worker.name = f"lcomp-worker-{spec.slot}"
+        except BaseException:
+            ldev.CloseLDevice()
+            raise
+
+        return Device(spec, ldev, board, descr, daqpar, reader, worker)
+
+    def _map(self, func: Any, items: Iterable[Any]) -> list[Any]:
+        with ThreadPoolExecutor(self._workers, thread_name_prefix="lcomp-manager") as pool:
+            return list(pool.map(func, items))
+
+    def open(self) -> None:
+        """Параллельное открытие, загрузка BIOS и настройка всех модулей."""
+
+        with ThreadPoolExecutor(self._workers, thread_name_prefix="lcomp-manager") as pool:
+            futures = [pool.submit(self._configure, spec) for spec in self._specs]
+
+        errors = []
+        for future in futures:
+            if error := future.exception():
+                errors.append(error)
+            else:
+                device = future.result()
+                self.devices[device.spec.slot] = device
+
+        if errors:
+            self.close()
+            raise errors[0]
+
+    def start(self) -> None:
+        """Запуск сбора на всех модулях подряд и запуск потоков обслуживания."""
+
+        devices = list(self.devices.values())
+        self._map(lambda device: device.ldev.InitStartLDevice(), devices)
+
+        for device in devices:
+            device.ldev.StartLDevice()
+            device.started = time.perf_counter()
+        self._started = devices[0].started if devices else time.perf_counter()
+
+        for device in devices:
+            device.worker.start()
+
+    def stop(self) -> None:
+        """Остановка сбора на всех модулях."""
+
+        for device in self.devices.values():
+            device.ldev.StopLDevice()
+        for device in self.devices.values():
+            device.worker.stop()
+
+    def close(self) -> None:
+        """Остановка сбора и закрытие всех модулей."""
+
+        for device in self.devices.values():
+            if device.worker.is_alive():
+                device.ldev.StopLDevice()
+                device.worker.stop()
+        self._map(lambda device: device.ldev.CloseLDevice(), self.devices.values())
+        self.devices.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Статистика сбора по каждому модулю и суммарная пропускная способность."""
+
+        now = time.perf_counter()
+        devices = {}
+        for slot, device in self.devices.items():
+            elapsed = now - device.started if device.started else 0.0
+            devices[slot] = {"board": L_DEVICE(device.board).name,
+                             "rate": sample_rate(device.daqpar),
+                             "bios_time": device.ldev.bios_time,
+                             "samples": device.worker.samples,
+                             "lost": device.worker.lost,
+                             "pending": device.worker.pending,
+                             "throughput": device.worker.samples / elapsed if elapsed else 0.0,
+                             "skew": device.started - self._started if device.started else 0.0}
+
+        return {"devices": devices,
+                "samples": sum(item["samples"] for item in devices.values()),
+                "lost": sum(item["lost"] for item in devices.values()),
+                "throughput": sum(item["throughput"] for item in devices.values())}
+
+
+__all__ = ["DeviceManager", "DeviceSpec"]
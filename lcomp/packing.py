@@ -0,0 +1,275 @@
+#! /usr/bin/env python3
+
+"""Плотная упаковка 12/14-разрядных кодов АЦП."""
+
+from __future__ import annotations
+
+import mmap
+import zlib
+from ctypes import Structure, c_char, c_ubyte, c_uint, c_ushort, sizeof
+from math import gcd
+from typing import TYPE_CHECKING, Iterator
+
+from numpy import (asarray, empty, frombuffer, int16, int64, ndarray, right_shift, uint8, uint16,
+                   uint64, zeros)
+
+from lcomp.rawfile import HEADER_SIZE, MAGIC, VERSION, RawHeader, make_header
+
+if TYPE_CHECKING:
+    from numpy import float32
+    from numpy.typing import ArrayLike, NDArray
+
+    from lcomp.ioctl import PLATA_DESCR_U2
+
+
+_BLOCK_MAGIC = b"LP"
+
+PACKED = 0          # коды упакованы по bits бит
+DELTA_ZLIB = 1      # разности с предыдущим кадром, сжатые zlib
+
+
+class BlockHeader(Structure):
+    """Заголовок упакованной порции данных."""
+
+    _pack_ = 1
+    _fields_ = [
+        ("magic", c_char * 2),
+        ("bits", c_ubyte),          # разрядность кода АЦП
+        ("mode", c_ubyte),          # PACKED или DELTA_ZLIB
+        ("nch", c_ushort),          # шаг разностей (количество каналов в кадре)
+        ("reserved", c_ushort),
+        ("count", c_uint),          # количество отсчетов
+        ("size", c_uint),           # размер данных после заголовка в байтах
+    ]
+
+
+def _geometry(bits: int) -> tuple[int, int]:
+    group = 8 // gcd(bits, 8)       # отсчетов в группе, занимающей целое число байт
+    return group, group * bits // 8
+
+
+def packed_size(count: int, bits: int) -> int:
+    """Размер в байтах count упакованных отсчетов."""
+
+    group, nbytes = _geometry(bits)
+    return -(-count // group) * nbytes
+
+
+def pack(codes: ArrayLike, bits: int) -> NDArray[uint8]:
+    """Упаковка кодов АЦП по bits бит на отсчет (старшие биты слов отбрасываются)."""
+
+    group, nbytes = _geometry(bits)
+    codes = asarray(codes).view(uint16).ravel()
+    groups = -(-codes.size // group)
+
+    words = zeros(groups * group, dtype=uint64)
+    words[:codes.size] = codes
+    words &= uint64((1 << bits) - 1)
+    words = words.reshape((groups, group))
+
+    packed = words[:, 0].copy()
+    for k in range(1, group):
+        packed |= words[:, k] << uint64(bits * k)
+
+    return packed.astype("<u8", copy=False).view(uint8).reshape((groups, 8))[:, :nbytes].ravel()
+
+
+def unpack(data: ArrayLike, bits: int, count: int,
+           out: NDArray[int16] | None = None) -> NDArray[int16]:
+    """Распаковка count отсчетов со знаковым расширением кода до int16."""
+
+    group, nbytes = _geometry(bits)
+    groups = -(-count // group)
+
+    # группы читаются как int64 с шагом nbytes байт, запас в конце - для последней группы
+    raw = empty(groups * nbytes + 8 - nbytes, dtype=uint8)
+    raw[:groups * nbytes] = frombuffer(data, uint8, groups * nbytes)
+    raw[groups * nbytes:] = 0
+    words = ndarray((groups,), "<i8", raw, 0, (nbytes,))
+
+    codes = empty((groups, group), dtype=int16)
+    for k in range(group):
+        # сдвиг кода в старшие разряды и обратно дает знаковое расширение
+        right_shift(words << int64(64 - bits * (k + 1)), int64(64 - bits),
+                    out=codes[:, k], casting="unsafe")
+
+    codes = codes.ravel()[:count]
+    if out is None:
+        return codes
+    out[:] = codes
+    return out
+
+
+def _delta(codes: NDArray[int16], step: int) -> NDArray[int16]:
+    delta = codes.copy()
+    delta[step:] -= codes[:-step]
+    return delta
+
+
+def _undelta(delta: NDArray[int16], step: int) -> NDArray[int16]:
+    frames = -(-delta.size // step)
+    codes = zeros(frames * step, dtype=int16)
+    codes[:delta.size] = delta
+    codes.reshape((frames, step)).cumsum(axis=0, dtype=int16, out=codes.reshape((frames, step)))
+    return codes[:delta.size]
+
+
+def encode(codes: ArrayLike, bits: int, nch: int = 1, mode: int = PACKED,
+           level: int = 1) -> bytes:
+    """Кодирование порции в блок с заголовком BlockHeader.
+
+    В режиме PACKED коды хранятся ровно по bits бит. В режиме DELTA_ZLIB
+    сохраняются разности кода со значением того же канала в предыдущем
+    кадре (nch - число каналов в кадре), сжатые zlib с уровнем level.
+    """
+
+    codes = asarray(codes).view(int16).ravel()
+    shift = int16(16 - bits)
+    codes = (codes << shift) >> shift       # знаковое расширение кода АЦП
+
+    if mode == PACKED:
+        payload = pack(codes, bits).tobytes()
+    elif mode == DELTA_ZLIB:
+        payload = zlib.compress(_delta(codes, nch).astype("<i2", copy=False).tobytes(), level)
+    else:
+        raise ValueError(f"unknown packing mode {mode}")
+
+    header = BlockHeader(_BLOCK_MAGIC, bits, mode, nch, 0, codes.size, len(payload))
+    return bytes(header) + payload
+
+
+def decode(buffer: ArrayLike, offset: int = 0,
+           out: NDArray[int16] | None = None) -> tuple[NDArray[int16], int]:
+    """Декодирование блока, начинающегося с offset.
+
+    Возвращает коды АЦП со знаковым расширением и смещение следующего блока.
+    """
+
+    header = BlockHeader.from_buffer_copy(buffer, offset)
+    if header.magic != _BLOCK_MAGIC:
+        raise ValueError(f"no packed block at offset {offset}")
+
+    start = offset + sizeof(BlockHeader)
+    payload = memoryview(buffer)[start:start + header.size]     # type: ignore[arg-type]
+
+    if header.mode == PACKED:
+        codes = unpack(payload, header.bits, header.count, out)
+    elif header.mode == DELTA_ZLIB:
+        delta = frombuffer(zlib.decompress(payload), "<i2").astype(int16, copy=False)
+        codes = _undelta(delta, header.nch)
+        if out is not None:
+            out[:] = codes
+            codes = out
+    else:
+        raise ValueError(f"unknown packing mode {header.mode}")
+
+    return codes, start + header.size
+
+
+class PackedRecorder:
+    """Запись порций кодов АЦП в файл упакованными блоками.
+
+    Файл начинается с того же заголовка RawHeader, что и у RawRecorder, с
+    полем bits, равным разрядности АЦП модуля, далее следуют блоки encode.
+    """
+
+    def __init__(self, filename: str, daqpar: Structure, descr: PLATA_DESCR_U2,
+                 board: int, mode: int = PACKED, level: int = 1) -> None:
+        """Создание файла и запись заголовка."""
+
+        from lcomp.device.converter import converter_class
+
+        self._header = make_header(daqpar, descr, board)
+        self._header.bits = converter_class(board)._bits_
+        self._mode = mode
+        self._level = level
+        self._file = open(filename, "wb")
+        self._file.write(bytes(self._header).ljust(HEADER_SIZE, b"\0"))
+        self.samples = 0
+
+    def __enter__(self) -> PackedRecorder:
+        """Входной блок контекстного менеджера."""
+
+        return self
+
+    def __exit__(self, exc_type: object, exc_value: object, traceback: object) -> None:
+        """Выходной блок контекстного менеджера."""
+
+        self.close()
+
+    def write(self, *regions: NDArray[int16]) -> None:
+        """Запись порции данных, заданной одним или несколькими массивами."""
+
+        for region in regions:
+            self._file.write(encode(region, self._header.bits, self._header.nch,
+                                    self._mode, self._level))
+            self.samples += region.size
+
+    def close(self) -> None:
+        """Запись числа отсчетов в заголовок и закрытие файла."""
+
+        if self._file.closed:
+            return
+
+        self._header.samples = self.samples
+        self._file.seek(0)
+        self._file.write(bytes(self._header))
+        self._file.close()
+
+
+class PackedReader:
+    """Последовательное чтение файла, записанного PackedRecorder."""
+
+    def __init__(self, filename: str) -> None:
+        """Открытие файла и чтение заголовка."""
+
+        with open(filename, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header = RawHeader.from_buffer_copy(self._map)
+        if header.magic != MAGIC or header.version != VERSION or header.bits == 16:
+            self._map.close()
+            raise ValueError(f"{filename} is not an lcomp packed file")
+
+        daqpar = header.daqpar
+        self.header = header
+        self.board: int = header.board
+        self.descr: PLATA_DESCR_U2 = header.descr
+        self.daqpar: Structure = daqpar.t4 if header.par else daqpar.t3
+        self.channels: int = header.nch
+
+    def __enter__(self) -> PackedReader:
+        """Входной блок контекстного менеджера."""
+
+        return self
+
+    def __exit__(self, exc_type: object, exc_value: object, traceback: object) -> None:
+        """Выходной блок контекстного менеджера."""
+
+        self.close()
+
+    def __iter__(self) -> Iterator[NDArray[int16]]:
+        """Перебор порций кодов АЦП в порядке записи."""
+
+        offset = self.header.header_size
+        while offset + sizeof(BlockHeader) <= len(self._map):
+            codes, offset = decode(self._map, offset)
+            yield codes
+
+    def volts(self) -> Iterator[NDArray[float32]]:
+        """Перебор порций в вольтах (канал, кадр)."""
+
+        from lcomp.device.converter import converter_class
+
+        converter = converter_class(self.board)(self.daqpar, self.descr)
+        for codes in self:
+            yield converter(codes)
+
+    def close(self) -> None:
+        """Закрытие файла."""
+
+        self._map.close()
+
+
+__all__ = ["DELTA_ZLIB", "PACKED", "BlockHeader", "PackedReader", "PackedRecorder", "decode",
+           "encode", "pack", "packed_size", "unpack"]
@@ -0,0 +1,161 @@
+#! /usr/bin/env python3
+
+"""Преобразование кодов АЦП в пуле процессов через разделяемую память."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
+
+from numpy import asarray, concatenate, empty, float32, int16, ndarray
+
+if TYPE_CHECKING:
+    from ctypes import Structure
+
+    from numpy.typing import ArrayLike, NDArray
+
+    from lcomp.device.converter import Converter
+    from lcomp.ioctl import PLATA_DESCR_U2
+
+
+_worker: dict[str, Any] = {}     # состояние процесса-обработчика
+
+
+def _initialize(raw_name: str, out_name: str, slabs: int, words: int, frames: int,
+                converter: type[Converter], par_type: type[Structure], par: bytes,
+                descr: bytes, func: Callable[[NDArray[float32]], Any] | None) -> None:
+    from lcomp.ioctl import PLATA_DESCR_U2
+
+    daqpar = par_type.from_buffer_copy(par)
+    # процессы пула используют общий с родителем resource_tracker,
+    # сегменты удаляются только родителем в close()
+    raw, out = SharedMemory(raw_name), SharedMemory(out_name)
+
+    _worker["shm"] = (raw, out)
+    _worker["raw"] = ndarray((slabs, words), int16, raw.buf)
+    _worker["out"] = ndarray((slabs, daqpar.NCh, frames), float32, out.buf)
+    _worker["converter"] = converter(daqpar, PLATA_DESCR_U2.from_buffer_copy(descr))
+    _worker["func"] = func
+
+
+def _process(slab: int, count: int) -> Any:
+    converter = _worker["converter"]
+    converter.reset()       # порция всегда состоит из целых кадров
+    volts = converter(_worker["raw"][slab, :count], out=_worker["out"][slab])
+
+    if (func := _worker["func"]) is not None:
+        return func(volts)
+    return volts.shape[1]
+
+
+class ConversionPipeline:
+    """Преобразование порций кодов АЦП в вольты в нескольких процессах.
+
+    Каждая порция один раз копируется в свободную ячейку разделяемой
+    памяти (вместе с остатком неполного кадра предыдущей порции), процесс
+    пула преобразует ее в соседнюю ячейку для результата, массивы между
+    процессами не сериализуются. Результаты выдаются в порядке поступления
+    порций. Если задана функция func, она выполняется в процессе пула над
+    массивом вольт (канал, кадр) и выдается ее результат, иначе выдается
+    представление ячейки результата, действительное до следующей итерации.
+    """
+
+    def __init__(self, converter: type[Converter], daqpar: Structure, descr: PLATA_DESCR_U2,
+                 block_size: int, slabs: int = 8, processes: int | None = None,
+                 func: Callable[[NDArray[float32]], Any] | None = None) -> None:
+        """Выделение slabs ячеек под порции до block_size отсчетов."""
+
+        nch = daqpar.NCh
+        words = block_size + nch
+        frames = words // nch
+
+        self._nch = nch
+        self._func = func
+        self._raw_shm = SharedMemory(create=True, size=slabs * words * 2)
+        self._out_shm = SharedMemory(create=True, size=slabs * nch * frames * 4)
+        self._raw = ndarray((slabs, words), int16, self._raw_shm.buf)
+        self._out = ndarray((slabs, nch, frames), float32, self._out_shm.buf)
+
+        self._pool = ProcessPoolExecutor(processes, initializer=_initialize,
+                                         initargs=(self._raw_shm.name, self._out_shm.name,
+                                                   slabs, words, frames, converter,
+                                                   type(daqpar), bytes(daqpar), bytes(descr),
+                                                   func))
+        self._free = deque(range(slabs))
+        self._pending: deque[tuple[int, Future[Any]]] = deque()
+        self._taken: int | None = None
+        self._tail = empty(0, dtype=int16)
+
+    def __enter__(self) -> ConversionPipeline:
+        """Входной блок контекстного менеджера."""
+
+        return self
+
+    def __exit__(self, exc_type: object, exc_value: object, traceback: object) -> None:
+        """Выходной блок контекстного менеджера."""
+
+        self.close()
+
+    def _submit(self, data: NDArray[int16]) -> None:
+        nch = self._nch
+        head = self._tail.size
+        size = head + data.size
+        count = size - size % nch
+        if count > self._raw.shape[1]:
+            raise ValueError("block is larger than block_size")
+        if not count:
+            # вместе с остатком порция не дает ни одного кадра
+            self._tail = concatenate((self._tail, data))
+            return
+
+        slab = self._free.popleft()
+        self._raw[slab, :head] = self._tail
+        self._raw[slab, head:count] = data[:count - head]
+        self._tail = data[count - head:].copy()
+
+        self._pending.append((slab, self._pool.submit(_process, slab, count)))
+
+    def _release(self) -> None:
+        # ячейка выданного результата освобождается, когда потребитель запросил следующий
+        if self._taken is not None:
+            self._free.append(self._taken)
+            self._taken = None
+
+    def _result(self) -> Any:
+        slab, future = self._pending.popleft()
+        result = future.result()
+        if self._func is not None:
+            self._free.append(slab)
+            return result
+
+        self._taken = slab
+        return self._out[slab, :, :result]
+
+    def map(self, blocks: Iterable[ArrayLike]) -> Iterator[Any]:
+        """Преобразование последовательности порций с выдачей результатов по порядку."""
+
+        for block in blocks:
+            self._release()
+            while not self._free:
+                yield self._result()
+                self._release()
+            self._submit(asarray(block).view(int16))
+
+        while self._pending:
+            self._release()
+            yield self._result()
+        self._release()
+
+    def close(self) -> None:
+        """Остановка пула и освобождение разделяемой памяти."""
+
+        self._pool.shutdown()
+        self._raw = self._out = None      # type: ignore[assignment]
+        for shm in (self._raw_shm, self._out_shm):
+            shm.close()
+            shm.unlink()
+
+
+__all__ = ["ConversionPipeline"]
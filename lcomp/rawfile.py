@@ -0,0 +1,265 @@
+#! /usr/bin/env python3
+
+"""Запись кодов АЦП в двоичный файл с самоописывающим заголовком."""
+
+from __future__ import annotations
+
+import errno
+import mmap
+import os
+import time
+from ctypes import (Structure, addressof, c_char, c_double, c_uint, c_ulonglong, memmove,
+                    sizeof)
+from typing import TYPE_CHECKING, Iterator
+
+from numpy import empty, frombuffer, int16, memmap
+
+from lcomp.ioctl import PLATA_DESCR_U2, WADC_PAR_1, WDAQ_PAR
+from lcomp.stream import sample_rate
+
+if TYPE_CHECKING:
+    from numpy import float32
+    from numpy.typing import NDArray
+
+
+MAGIC = b"LCOMPRAW"
+VERSION = 1
+HEADER_SIZE = 4096          # данные начинаются с границы страницы
+_CHUNK = 4 << 20
+
+
+class RawHeader(Structure):
+    """Заголовок файла записи. Занимает HEADER_SIZE байт, далее отсчеты int16."""
+
+    _pack_ = 8
+    _fields_ = [
+        ("magic", c_char * 8),
+        ("version", c_uint),
+        ("header_size", c_uint),        # смещение данных от начала файла
+        ("board", c_uint),              # тип модуля (L_DEVICE) из GetSlotParam
+        ("par", c_uint),                # 0 - WADC_PAR_0, 1 - WADC_PAR_1
+        ("nch", c_uint),                # количество каналов в кадре
+        ("bits", c_uint),               # бит на отсчет в файле
+        ("rate", c_double),             # частота поступления отсчетов (в секунду)
+        ("time", c_double),             # время начала записи (секунды от эпохи)
+        ("samples", c_ulonglong),       # количество отсчетов (заполняется при закрытии)
+        ("daqpar", WDAQ_PAR),
+        ("descr", PLATA_DESCR_U2),
+    ]
+
+
+def make_header(daqpar: Structure, descr: PLATA_DESCR_U2, board: int) -> RawHeader:
+    """Заполнение заголовка по параметрам сбора и калибровке модуля."""
+
+    header = RawHeader()
+    header.magic = MAGIC
+    header.version = VERSION
+    header.header_size = HEADER_SIZE
+    header.board = board
+    header.par = isinstance(daqpar, WADC_PAR_1)
+    header.nch = daqpar.NCh
+    header.bits = 16
+    header.rate = sample_rate(daqpar)
+    header.time = time.time()
+    memmove(addressof(header.daqpar), addressof(daqpar), sizeof(daqpar))
+    header.descr = descr
+    return header
+
+
+def _write_all(fd: int, data: object) -> None:
+    # os.write может записать меньше запрошенного (например, при заполнении диска)
+    view = memoryview(data).cast("B")   # type: ignore[arg-type]
+    while view.nbytes:
+        written = os.write(fd, view)
+        if not written:
+            raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+        view = view[written:]
+
+
+class RawRecorder:
+    """Потоковая запись порций кольцевого буфера в файл без преобразования.
+
+    Порции копируются в выровненный по странице буфер размером chunk байт
+    и записываются в файл целыми буферами. При direct=True файл
+    открывается с O_DIRECT (если система его поддерживает) и данные идут
+    мимо страничного кэша. preallocate резервирует место под указанное
+    число байт заранее, лишнее отрезается при закрытии.
+    """
+
+    def __init__(self, filename: str, daqpar: Structure, descr: PLATA_DESCR_U2,
+                 board: int, chunk: int = _CHUNK, direct: bool = False,
+                 preallocate: int = 0) -> None:
+        """Создание файла и запись заголовка."""
+
+        chunk -= chunk % mmap.PAGESIZE
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        self._direct = direct and hasattr(os, "O_DIRECT")
+        if self._direct:
+            flags |= os.O_DIRECT
+
+        self._fd = os.open(filename, flags, 0o644)
+        try:
+            if preallocate and hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(self._fd, 0, HEADER_SIZE + preallocate)
+
+            self._header = make_header(daqpar, descr, board)
+            self._page = mmap.mmap(-1, HEADER_SIZE)
+            self._page[:sizeof(RawHeader)] = bytes(self._header)
+            _write_all(self._fd, self._page)
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+        self._buffer = mmap.mmap(-1, chunk)      # выровнен по странице
+        self._chunk = frombuffer(self._buffer, int16)
+        self._fill = 0
+        self.samples = 0
+
+    def __enter__(self) -> RawRecorder:
+        """Входной блок контекстного менеджера."""
+
+        return self
+
+    def __exit__(self, exc_type: object, exc_value: object, traceback: object) -> None:
+        """Выходной блок контекстного менеджера."""
+
+        self.close()
+
+    def _flush(self) -> None:
+        _write_all(self._fd, memoryview(self._buffer)[:self._fill * 2])
+        self._fill = 0
+
+    def write(self, *regions: NDArray[int16]) -> None:
+        """Запись порции данных, заданной одним или несколькими массивами."""
+
+        size = self._chunk.size
+        for region in regions:
+            self.samples += region.size
+            while region.size:
+                count = min(region.size, size - self._fill)
+                self._chunk[self._fill:self._fill + count] = region[:count]
+                self._fill += count
+                region = region[count:]
+                if self._fill == size:
+                    self._flush()
+
+    def close(self) -> None:
+        """Запись остатка данных, числа отсчетов в заголовок и закрытие файла."""
+
+        if self._fd < 0:
+            return
+
+        try:
+            if self._direct and self._fill:
+                # хвост не кратен размеру блока, пишется обычным образом
+                import fcntl
+                fcntl.fcntl(self._fd, fcntl.F_SETFL,
+                            fcntl.fcntl(self._fd, fcntl.F_GETFL) & ~os.O_DIRECT)
+            self._flush()
+            os.ftruncate(self._fd, HEADER_SIZE + self.samples * 2)
+
+            self._header.samples = self.samples
+            self._page[:sizeof(RawHeader)] = bytes(self._header)
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            _write_all(self._fd, self._page)
+        finally:
+            os.close(self._fd)
+            self._fd = -1
+            del self._chunk
+            self._buffer.close()
+            self._page.close()
+
+
+class RawReader:
+    """Чтение файла записи через отображение в память.
+
+    Открытие читает только заголовок, данные доступны как массив
+    (кадр, канал) поверх отображенного файла, поэтому срезы по кадрам или
+    времени и выборка одного канала затрагивают только нужные страницы.
+    Перевод в вольты выполняется по частям преобразователем модуля.
+    Если запись была прервана и число отсчетов в заголовке не заполнено,
+    оно определяется по размеру файла.
+    """
+
+    def __init__(self, filename: str) -> None:
+        """Открытие файла и чтение заголовка."""
+
+        with open(filename, "rb") as file:
+            header = RawHeader.from_buffer_copy(file.read(sizeof(RawHeader)))
+            size = os.fstat(file.fileno()).st_size
+
+        if header.magic != MAGIC or header.version != VERSION or header.bits != 16:
+            raise ValueError(f"{filename} is not an lcomp raw file")
+
+        samples = header.samples or (size - header.header_size) // 2
+        daqpar = header.daqpar
+
+        self.header = header
+        self.board: int = header.board
+        self.descr: PLATA_DESCR_U2 = header.descr
+        self.daqpar: Structure = daqpar.t4 if header.par else daqpar.t3
+        self.channels: int = header.nch
+        self.rate: float = header.rate / header.nch if header.nch else 0.0    # кадров в секунду
+        self.time: float = header.time
+
+        frames = samples // header.nch if header.nch else 0
+        if frames:
+            self.data: NDArray[int16] = memmap(filename, int16, "r", header.header_size,
+                                               (frames, header.nch))
+        else:
+            self.data = empty((0, header.nch), dtype=int16)
+
+    def __enter__(self) -> RawReader:
+        """Входной блок контекстного менеджера."""
+
+        return self
+
+    def __exit__(self, exc_type: object, exc_value: object, traceback: object) -> None:
+        """Выходной блок контекстного менеджера."""
+
+        self.close()
+
+    def __len__(self) -> int:
+        """Количество полных кадров в файле."""
+
+        return len(self.data)
+
+    def __getitem__(self, key: int | slice) -> NDArray[int16]:
+        """Коды АЦП (кадр, канал) по номеру или срезу кадров."""
+
+        return self.data[key]
+
+    def channel(self, index: int) -> NDArray[int16]:
+        """Коды АЦП одного канала (представление с шагом в кадр)."""
+
+        return self.data[:, index]
+
+    def index(self, seconds: float) -> int:
+        """Номер кадра, соответствующий времени от начала записи."""
+
+        return min(max(round(seconds * self.rate), 0), len(self.data))
+
+    def between(self, start: float, stop: float) -> NDArray[int16]:
+        """Коды АЦП (кадр, канал) за интервал времени от начала записи (в секундах)."""
+
+        return self.data[self.index(start):self.index(stop)]
+
+    def volts(self, start: int = 0, stop: int | None = None,
+              chunk: int = 65536) -> Iterator[NDArray[float32]]:
+        """Перевод кадров [start, stop) в вольты порциями (канал, кадр) по chunk кадров."""
+
+        from lcomp.device.converter import converter_class
+
+        converter = converter_class(self.board)(self.daqpar, self.descr)
+        start, stop, _ = slice(start, stop).indices(len(self.data))
+        for first in range(start, stop, chunk):
+            yield converter(self.data[first:min(first + chunk, stop)].reshape(-1))
+
+    def close(self) -> None:
+        """Освобождение отображения файла (после удаления полученных представлений)."""
+
+        self.data = empty((0, self.channels), dtype=int16)
+
+
+__all__ = ["HEADER_SIZE", "MAGIC", "RawHeader", "RawReader", "RawRecorder", "VERSION",
+           "make_header"]
@@ -0,0 +1,250 @@
+#! /usr/bin/env python3
+
+"""Публикация потока АЦП другим локальным процессам через разделяемую память."""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from ctypes import (Structure, addressof, c_char, c_double, c_uint, c_ulonglong, memmove,
+                    sizeof)
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
+
+from numpy import int16, ndarray
+
+from lcomp.ioctl import PLATA_DESCR_U2, WADC_PAR_1, WDAQ_PAR
+from lcomp.stream import _MIN_SLEEP, sample_rate
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from lcomp.stream import StreamReader
+
+
+_MAGIC = b"LCOMPSHM"
+_VERSION = 1
+
+
+def _attach(name: str) -> SharedMemory:
+    # сегмент удаляет только публикатор, подписчик из другого процесса
+    # не должен регистрировать его в своем resource_tracker
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name, track=False)
+
+    shm = SharedMemory(name)
+    resource_tracker.unregister(shm._name, "shared_memory")     # type: ignore[attr-defined]
+    return shm
+
+
+class _Header(Structure):
+    _pack_ = 8
+    _fields_ = [
+        ("magic", c_char * 8),
+        ("version", c_uint),
+        ("board", c_uint),              # тип модуля (L_DEVICE)
+        ("par", c_uint),                # 0 - WADC_PAR_0, 1 - WADC_PAR_1
+        ("size", c_uint),               # размер кольца в отсчетах
+        ("rate", c_double),             # частота поступления отсчетов (в секунду)
+        ("write", c_ulonglong),         # общее число опубликованных отсчетов
+        ("daqpar", WDAQ_PAR),
+        ("descr", PLATA_DESCR_U2),
+    ]
+
+
+class Publisher:
+    """Копирование кольцевого буфера драйвера в именованное кольцо.
+
+    Сегмент разделяемой памяти содержит заголовок (счетчик записанных
+    отсчетов, параметры сбора WDAQ_PAR, калибровку PLATA_DESCR_U2 и тип
+    модуля) и кольцо отсчетов int16. Счетчик увеличивается после
+    копирования порции, поэтому подписчики видят только записанные данные.
+    Публикатор никогда не ждет подписчиков.
+    """
+
+    def __init__(self, name: str, reader: StreamReader, daqpar: Structure,
+                 descr: PLATA_DESCR_U2, board: int, size: int | None = None) -> None:
+        """Создание сегмента name с кольцом на size отсчетов (по умолчанию как у reader)."""
+
+        size = size or reader.size
+        self._reader = reader
+        self._shm = SharedMemory(name, create=True, size=sizeof(_Header) + size * 2)
+        self._header = _Header.from_buffer(self._shm.buf)
+        self._ring = ndarray((size,), int16, self._shm.buf, sizeof(_Header))
+        self._size = size
+
+        header = self._header
+        header.version = _VERSION
+        header.board = board
+        header.par = isinstance(daqpar, WADC_PAR_1)
+        header.size = size
+        header.rate = sample_rate(daqpar)
+        header.write = 0
+        memmove(addressof(header.daqpar), addressof(daqpar), sizeof(daqpar))
+        header.descr = descr
+        header.magic = _MAGIC           # заголовок заполнен
+
+    @property
+    def name(self) -> str:
+        """Имя сегмента разделяемой памяти."""
+
+        return self._shm.name
+
+    def __enter__(self) -> Publisher:
+        """Входной блок контекстного менеджера."""
+
+        return self
+
+    def __exit__(self, exc_type: object, exc_value: object, traceback: object) -> None:
+        """Выходной блок контекстного менеджера."""
+
+        self.close()
+
+    def publish(self, *regions: NDArray[int16]) -> int:
+        """Публикация порции данных, заданной одним или несколькими массивами."""
+
+        write = self._header.write
+        count = 0
+        for region in regions:
+            count += region.size
+            region = region[-self._size:]
+            start = (write + count - region.size) % self._size
+            first = min(region.size, self._size - start)
+            self._ring[start:start + first] = region[:first]
+            self._ring[:region.size - first] = region[first:]
+
+        self._header.write = write + count
+        return count
+
+    def pump(self, timeout: float | None = None) -> int:
+        """Публикация всех новых данных буфера драйвера (ожидание не дольше timeout)."""
+
+        if not self._reader.wait_for(0, timeout):
+            return 0
+        return self.publish(*self._reader.read())
+
+    def run(self, halt: threading.Event, interval: float = 0.05) -> None:
+        """Публикация данных до установки события halt или завершения сбора."""
+
+        while not halt.is_set() and not self._reader.finished:
+            self.pump(interval)
+
+    def close(self) -> None:
+        """Удаление сегмента разделяемой памяти."""
+
+        self._header = self._ring = None        # type: ignore[assignment]
+        self._shm.close()
+        self._shm.unlink()
+
+
+class Subscriber:
+    """Чтение кольца, опубликованного Publisher, без копирования.
+
+    Порции возвращаются представлениями numpy прямо на сегмент. Отстающий
+    подписчик не тормозит публикатор: если публикатор ушел вперед больше
+    чем на размер кольца, непрочитанные отсчеты считаются потерянными
+    (счетчик lost), и чтение продолжается с самых старых доступных данных.
+    Представление остается верным, пока публикатор не запишет поверх него,
+    проверить это после обработки можно методом valid (публикатор
+    копирует порцию до обновления счетчика, поэтому запас в одну порцию
+    публикатора обеспечивает сам подписчик).
+    """
+
+    def __init__(self, name: str, latest: bool = True) -> None:
+        """Подключение к сегменту name (с текущей позиции при latest=True)."""
+
+        self._shm = _attach(name)
+        self._header = _Header.from_buffer(self._shm.buf)
+        if self._header.magic != _MAGIC or self._header.version != _VERSION:
+            self.close()
+            raise ValueError(f"{name} is not an lcomp stream")
+
+        self._size = self._header.size
+        self._ring = ndarray((self._size,), int16, self._shm.buf, sizeof(_Header))
+
+        self.board = self._header.board
+        self.descr = PLATA_DESCR_U2.from_buffer_copy(self._header.descr)
+        daqpar = WDAQ_PAR.from_buffer_copy(self._header.daqpar)
+        self.daqpar = daqpar.t4 if self._header.par else daqpar.t3
+        self.rate = self._header.rate
+        self.position = self._header.write if latest else 0
+        self.lost = 0
+        self._start = self.position
+
+    @property
+    def size(self) -> int:
+        """Размер кольца в отсчетах."""
+
+        return self._size
+
+    def __enter__(self) -> Subscriber:
+        """Входной блок контекстного менеджера."""
+
+        return self
+
+    def __exit__(self, exc_type: object, exc_value: object, traceback: object) -> None:
+        """Выходной блок контекстного менеджера."""
+
+        self.close()
+
+    def available(self) -> int:
+        """Количество опубликованных, но еще не прочитанных отсчетов."""
+
+        return min(self._header.write - self.position, self._size)
+
+    def read(self, count: int | None = None) -> tuple[NDArray[int16], ...]:
+        """Возвращает новую порцию данных (не более count отсчетов)."""
+
+        write = self._header.write
+        if write - self.position > self._size:
+            self.lost += write - self.position - self._size
+            self.position = write - self._size
+
+        available = write - self.position
+        if count is not None:
+            available = min(available, count)
+        if not available:
+            return ()
+
+        self._start = self.position
+        start = self.position % self._size
+        stop = start + available
+        self.position += available
+        if stop <= self._size:
+            return (self._ring[start:stop],)
+        return (self._ring[start:], self._ring[:stop - self._size])
+
+    def valid(self, position: int | None = None) -> bool:
+        """Данные начиная с position (по умолчанию начало последней порции) еще не перезаписаны."""
+
+        if position is None:
+            position = self._start
+        return self._header.write - position <= self._size
+
+    def wait_for(self, samples: int, timeout: float | None = None,
+                 interval: float = 0.05) -> bool:
+        """Ожидание, пока станет доступно не менее samples отсчетов."""
+
+        samples = min(max(samples, 1), self._size)
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while (available := self.available()) < samples:
+            delay = (samples - available) / self.rate / 2 if self.rate else interval
+            if deadline is not None:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    return False
+                delay = min(delay, left)
+            time.sleep(min(max(delay, _MIN_SLEEP), interval))
+
+        return True
+
+    def close(self) -> None:
+        """Отключение от сегмента."""
+
+        self._header = self._ring = None        # type: ignore[assignment]
+        self._shm.close()
+
+
+__all__ = ["Publisher", "Subscriber"]
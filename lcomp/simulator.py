@@ -0,0 +1,649 @@
+#! /usr/bin/env python3
+
+"""Программная модель библиотеки wlcomp для работы без плат LCARD.
+
+Модель реализует те же точки входа, что описаны в IDaqLDevice._functions_,
+и подключается вместо libwlcomp.so/liblcomp.so установкой переменной
+окружения LCOMP_SIMULATOR до импорта lcomp.lcomp. Значение переменной -
+перечень типов модулей по слотам, например "E140,E2010B". Сбор данных
+моделируется потоком, который заполняет настоящий кольцевой буфер
+синусоидальными сигналами и продвигает счетчик sync с частотой,
+заданной параметрами dRate/dKadr.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from binascii import crc_hqx
+from ctypes import addressof, c_ubyte, c_uint, c_ushort, memmove, sizeof
+from functools import wraps
+from typing import TYPE_CHECKING, Callable
+
+from numpy import arange, concatenate, float64, frombuffer, int16, pi, rint, sin, uint16
+from numpy.random import default_rng
+
+from lcomp.ioctl import (L_ASYNC, L_BOARD_TYPE, L_DATA_ADDR_HI, L_DATA_ADDR_LO, L_DEVICE,
+                         L_ERROR, L_POINT_SIZE, L_STREAM, L_SYNC_ADDR_HI, L_SYNC_ADDR_LO,
+                         L_USER_BASE, PLATA_DESCR_U2, SLOT_PAR, WADC_PAR_0, WADC_PAR_1,
+                         WASYNC_PAR, WDAC_PAR_0, WDAC_PAR_1, WORD_IMAGE_256)
+from lcomp.stream import sample_rate
+
+if TYPE_CHECKING:
+    from ctypes import _Pointer, c_void_p
+
+    from numpy.typing import NDArray
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+
+_SP_TYPES = (WDAC_PAR_0, WDAC_PAR_1, WADC_PAR_0, WADC_PAR_1)
+
+# разрядность кода АЦП, код полной шкалы и маска номера канала в Chn
+_ADC_FORMAT = {
+    L_DEVICE.E140: (14, 8000, 0x1F),
+    L_DEVICE.E154: (12, 2000, 0x0F),
+    L_DEVICE.E440: (14, 8000, 0x0F),
+    L_DEVICE.E2010: (14, 8000, 0x03),
+    L_DEVICE.E2010B: (14, 8000, 0x03),
+    L_DEVICE.L791: (14, 8192, 0x1F),
+}
+
+
+def _plata_descr(board: L_DEVICE, slot: int) -> PLATA_DESCR_U2:
+    """Описатель платы с правдоподобными калибровочными коэффициентами."""
+
+    descr = PLATA_DESCR_U2()
+    rng = default_rng(slot)
+    serial = f"{slot + 1}T{board.value:03d}{slot:04d}".encode("ascii")
+
+    if board == L_DEVICE.E140:
+        part, name, dsp, quartz, ranges = descr.t5, b"E140", b"ATMEGA", 16000000, 4
+    elif board == L_DEVICE.E154:
+        part, name, dsp, quartz, ranges = descr.t7, b"E154", b"ATMEGA", 16000000, 4
+    elif board in {L_DEVICE.E2010, L_DEVICE.E2010B}:
+        part, name, dsp, quartz, ranges = descr.t6, b"E20-10", b"ADSP-2185", 30000000, 12
+    elif board == L_DEVICE.L791:
+        part, name, dsp, quartz, ranges = descr.t3, b"L791", b"ARM", 30000000, 8
+    else:
+        # коэффициенты E14-440 используются DSP модуля при EnableCorrection,
+        # поэтому программная модель отдает нейтральные значения
+        part, name, dsp, quartz = descr.t4, b"E440", b"2185", 24000000
+        part.KoefADC[:] = [0, 0, 0, 0, 1, 1, 1, 1]
+        ranges = 0
+
+    for idx in range(ranges):
+        part.KoefADC[idx] = round(rng.uniform(-6.0, 6.0), 3)             # OffsetCalibration
+        part.KoefADC[idx + ranges] = round(rng.uniform(0.995, 1.005), 5) # ScaleCalibration
+
+    part.SerNum = serial
+    part.BrdName = name
+    part.Rev = b"B" if board == L_DEVICE.E2010B else b"A"
+    part.DspType = dsp
+    part.Quartz = quartz
+    part.IsDacPresent = 1
+    return descr
+
+
+# описатели, которые модули E14-140 и E154 хранят во Flash в упакованном виде
+_PACKED = {L_DEVICE.E140: ("t5", "pt5"), L_DEVICE.E154: ("t7", "pt7")}
+
+
+def _flash_image(board: L_DEVICE, descr: PLATA_DESCR_U2) -> WORD_IMAGE_256:
+    """Образ Flash с описателем платы и контрольными суммами.
+
+    Алгоритмы контрольных сумм в модели условные: CRC-16 (crc_hqx) для
+    E20-10 и L791, сумма байт для упакованных описателей E14-140/E154.
+    """
+
+    if board in _PACKED:
+        flash = PLATA_DESCR_U2()
+        unpacked, packed = getattr(descr, _PACKED[board][0]), getattr(flash, _PACKED[board][1])
+        serial = unpacked.SerNum
+        packed.SerNum1 = int(serial[:1] or 0)
+        packed.SerNum2 = serial[1:2]
+        packed.SerNum3 = int(serial[2:] or 0)
+        packed.Name = unpacked.BrdName[:10]
+        packed.Rev = unpacked.Rev
+        packed.DspType = unpacked.DspType[:10]
+        packed.Quartz = unpacked.Quartz
+        packed.IsDacPresent = unpacked.IsDacPresent
+        packed.AdcOffs[:] = unpacked.KoefADC[:4]
+        packed.AdcScale[:] = unpacked.KoefADC[4:]
+        packed.DacOffs[:] = unpacked.KoefDAC[:2]
+        packed.DacScale[:] = unpacked.KoefDAC[2:]
+        image = bytes(flash)
+        packed.CRC1 = sum(image[:type(packed).CRC1.offset]) & 0xFF
+        packed.CRC2 = sum(image[:type(packed).CRC2.offset]) & 0xFF
+        return flash.wi256
+
+    flash = PLATA_DESCR_U2.from_buffer_copy(descr)
+    if board in {L_DEVICE.E2010, L_DEVICE.E2010B}:
+        flash.t6.CRC = crc_hqx(bytes(flash)[:type(flash.t6).CRC.offset], 0)
+    elif board == L_DEVICE.L791:
+        flash.t3.CRC16 = crc_hqx(bytes(flash)[2:sizeof(flash.t3)], 0)
+
+    return flash.wi256
+
+
+def _unpack_descr(board: L_DEVICE, flash: WORD_IMAGE_256) -> PLATA_DESCR_U2:
+    """Описатель платы, каким его возвращает ReadPlataDescr, по образу Flash."""
+
+    image = PLATA_DESCR_U2.from_buffer_copy(flash)
+    if board not in _PACKED:
+        return image
+
+    descr = PLATA_DESCR_U2()
+    unpacked, packed = getattr(descr, _PACKED[board][0]), getattr(image, _PACKED[board][1])
+    unpacked.SerNum = f"{packed.SerNum1}{packed.SerNum2.decode()}{packed.SerNum3:07d}".encode()
+    unpacked.BrdName = packed.Name
+    unpacked.Rev = packed.Rev
+    unpacked.DspType = packed.DspType
+    unpacked.Quartz = packed.Quartz
+    unpacked.IsDacPresent = packed.IsDacPresent
+    unpacked.KoefADC[:] = packed.AdcOffs[:] + packed.AdcScale[:]
+    unpacked.KoefDAC[:] = packed.DacOffs[:] + packed.DacScale[:]
+    return descr
+
+
+class _Acquisition(threading.Thread):
+    """Поток, имитирующий заполнение кольцевого буфера АЦП платой."""
+
+    def __init__(self, device: _Device) -> None:
+        super().__init__(name=f"lcomp-sim-{device.slot}", daemon=True)
+
+        self._device = device
+        self._halt = threading.Event()
+
+    def stop(self) -> None:
+        self._halt.set()
+        self.join()
+
+    def run(self) -> None:
+        device = self._device
+        ring, pattern, sync = device.ring, device.pattern, device.sync
+        step, used, period = device.step, ring.size, pattern.size // 2
+        cyclic = bool(device.adcpar.AutoInit)
+        rate = sample_rate(device.adcpar)
+        interval = min(max(step / rate, 0.0005), 0.05)
+
+        total = 0
+        start = time.perf_counter()
+        while not self._halt.wait(interval):
+            due = int((time.perf_counter() - start) * rate)
+            while total + step <= due:
+                pos = total % used
+                offset = total % period
+                ring[pos:pos + step] = pattern[offset:offset + step]
+                total += step
+
+                if not cyclic and total >= used:
+                    sync.value = used
+                    return
+                sync.value = total % used
+
+
+class _Device:
+    """Состояние одного виртуального слота."""
+
+    def __init__(self, slot: int, board: L_DEVICE) -> None:
+        self.slot = slot
+        self.board = board
+        self.flash = _flash_image(board, _plata_descr(board, slot))
+        self.opened = False
+        self.flash_write = False
+
+        self.params = (c_uint * 128)()
+        self.ports = (c_ubyte * 0x10000)()
+        self.memory = (c_ubyte * 0x10000)()
+        self.dm = (c_ushort * 0x10000)()
+        self.pm = (c_uint * 0x10000)()
+        self.ttl = 0
+
+        self.adcpar = WADC_PAR_0()
+        self.dacpar = WDAC_PAR_0()
+        self.buffers: dict[int, object] = {}
+        self.sync = c_uint()
+        self.ring = frombuffer(b"", uint16)
+        self.pattern = self.ring
+        self.step = 0
+        self.thread: _Acquisition | None = None
+
+    def waveform(self, channel: int, phase: NDArray[float64]) -> NDArray[float64]:
+        """Сигнал на канале в кодах АЦП для фазы 0..1 периода модели."""
+
+        _, scale, mask = _ADC_FORMAT[self.board]
+        number = channel & mask
+        return scale * 0.8 / (1 + number % 4) * sin(2.0 * pi * (number + 1) * phase)
+
+    def make_pattern(self) -> None:
+        """Подготовка удвоенного периода сигнала для копирования в кольцо."""
+
+        nch = self.adcpar.NCh
+        frames = max(1024, -(-2 * self.step // nch))
+        phase = arange(frames, dtype=float64) / frames
+
+        codes = default_rng(self.slot).normal(0.0, 1.5, (frames, nch))
+        for ch in range(nch):
+            codes[:, ch] += self.waveform(self.adcpar.Chn[ch], phase)
+
+        bits, *_ = _ADC_FORMAT[self.board]
+        words = rint(codes).astype(int16).view(uint16) & ((1 << bits) - 1)
+        period = words.reshape(-1)
+        self.pattern = concatenate((period, period))
+
+    def stop(self) -> None:
+        if self.thread is not None:
+            self.thread.stop()
+            self.thread = None
+
+
+def _entry(func: Callable[..., int]) -> Callable[..., int]:
+    """Поиск устройства по интерфейсу и перевод исключений в коды ошибок."""
+
+    @wraps(func)
+    def wrapper(self: Simulator, ifc: int | None, *arguments: object) -> int:
+        device = self._devices.get(ifc or 0)
+        if device is None:
+            return L_ERROR.NO_BOARD
+
+        try:
+            return func(self, device, *arguments)
+        except Exception:
+            _logger.exception("%s failed", func.__name__)
+            return L_ERROR.ERROR
+
+    return wrapper
+
+
+class Simulator:
+    """Программная модель библиотеки wlcomp."""
+
+    _handle = 0     # заменяет дескриптор liblcomp в CallCreateInstance
+
+    def __init__(self, boards: list[L_DEVICE]) -> None:
+        """Инициализация модели с заданными по слотам типами модулей."""
+
+        self._boards = boards
+        self._devices: dict[int, _Device] = {}
+
+    @classmethod
+    def from_string(cls, boards: str) -> Simulator:
+        """Создание модели по перечню типов модулей через запятую."""
+
+        names = [name.strip().upper() for name in boards.split(",") if name.strip()]
+        supported = [board.name for board in _ADC_FORMAT]
+        if unknown := [name for name in names if name not in supported]:
+            raise ValueError(f"unknown board types {unknown}, expected {supported}")
+        if not names:
+            raise ValueError("no board types given")
+
+        return cls([L_DEVICE[name] for name in names])
+
+    def CallCreateInstance(self, hdll: int | None, slot: int, err: _Pointer[c_uint]) -> int | None:
+        if slot >= len(self._boards):
+            err[0] = L_ERROR.NO_BOARD
+            return None
+
+        device = _Device(slot, self._boards[slot])
+        handle = id(device)
+        self._devices[handle] = device
+
+        err[0] = L_ERROR.SUCCESS
+        return handle
+
+# Основные функции
+
+    def OpenLDevice(self, ifc: int | None) -> int:
+        device = self._devices.get(ifc or 0)
+        if device is None:
+            return -1
+
+        device.opened = True
+        return device.slot + 1
+
+    def CloseLDevice(self, ifc: int | None) -> int:
+        device = self._devices.pop(ifc or 0, None)
+        if device is None:
+            return L_ERROR.NO_BOARD
+
+        device.stop()
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def LoadBios(self, device: _Device, filename: bytes) -> int:
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def PlataTest(self, device: _Device) -> int:
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def GetSlotParam(self, device: _Device, slpar: _Pointer[SLOT_PAR]) -> int:
+        slpar[0] = SLOT_PAR(BoardType=device.board, DSPType=2)
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def ReadPlataDescr(self, device: _Device, descr: _Pointer[PLATA_DESCR_U2]) -> int:
+        descr[0] = _unpack_descr(device.board, device.flash)
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def WritePlataDescr(self, device: _Device, descr: _Pointer[PLATA_DESCR_U2],
+                        enable: int) -> int:
+        if not device.flash_write:
+            return L_ERROR.ERROR
+
+        device.flash = _flash_image(device.board, descr[0])
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def ReadFlashWord(self, device: _Device, address: int, data: _Pointer[c_ushort]) -> int:
+        data[0] = device.flash.data[address % 128]
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def WriteFlashWord(self, device: _Device, address: int, value: int) -> int:
+        if not device.flash_write:
+            return L_ERROR.ERROR
+
+        device.flash.data[address % 128] = value
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def RequestBufferStream(self, device: _Device, size: _Pointer[c_uint], stream_id: int) -> int:
+        device.buffers[stream_id] = (c_ushort * size[0])()
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def FillDAQparameters(self, device: _Device, sp: int, sp_type: int) -> int:
+        daqpar = _SP_TYPES[sp_type].from_address(sp)
+        if sp_type < 2:
+            device.dacpar = _SP_TYPES[sp_type].from_buffer_copy(daqpar)
+            return L_ERROR.SUCCESS
+
+        if not 0 < daqpar.NCh <= 128 or daqpar.dRate <= 0:
+            return L_ERROR.ERROR
+
+        device.adcpar = _SP_TYPES[sp_type].from_buffer_copy(daqpar)
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def SetParametersStream(self, device: _Device, sp: int, sp_type: int,
+                            used_size: _Pointer[c_uint], data: _Pointer[c_void_p],
+                            sync: _Pointer[c_void_p], stream_id: int) -> int:
+        buffer = device.buffers[stream_id]
+        daqpar = device.dacpar if sp_type < 2 else device.adcpar
+
+        size = min(used_size[0] or len(buffer), len(buffer))
+        step = min(max(daqpar.IrqStep, 1), size)
+        pages = size // step
+
+        daqpar.IrqStep = step
+        daqpar.Pages = pages
+        daqpar.FIFO = min(max(daqpar.FIFO, 1), step)
+
+        result = _SP_TYPES[sp_type].from_address(sp)
+        result.IrqStep, result.Pages, result.FIFO = daqpar.IrqStep, daqpar.Pages, daqpar.FIFO
+        used_size[0] = pages * step
+        data[0] = addressof(buffer)
+        sync[0] = addressof(device.sync)
+
+        if stream_id == L_STREAM.ADC:
+            device.step = step
+            device.ring = frombuffer(buffer, uint16)[:pages * step]
+            device.make_pattern()
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def InitStartLDevice(self, device: _Device) -> int:
+        device.stop()
+        device.sync.value = 0
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def StartLDevice(self, device: _Device) -> int:
+        if not device.ring.size:
+            return L_ERROR.ERROR
+
+        device.stop()
+        device.thread = _Acquisition(device)
+        device.thread.start()
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def StopLDevice(self, device: _Device) -> int:
+        device.stop()
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def EnableCorrection(self, device: _Device, enable: int) -> int:
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def IoAsync(self, device: _Device, sp: _Pointer[WASYNC_PAR]) -> int:
+        return self._io_async(device, sp[0])
+
+    @_entry
+    def IoAsyncBatch(self, device: _Device, sp: _Pointer[WASYNC_PAR], count: int,
+                     chn: _Pointer[c_uint], data: _Pointer[c_uint]) -> int:
+        asp = WASYNC_PAR.from_buffer_copy(sp[0])
+        for index in range(count):
+            asp.Chn[0] = chn[index]
+            if error := self._io_async(device, asp):
+                return error
+            data[index] = asp.Data[0]
+
+        return L_ERROR.SUCCESS
+
+    @staticmethod
+    def _io_async(device: _Device, asp: WASYNC_PAR) -> int:
+        if asp.s_Type == L_ASYNC.ADC_INP:
+            bits, *_ = _ADC_FORMAT[device.board]
+            code = int(rint(device.waveform(asp.Chn[0], time.perf_counter() % 1.0)))
+            asp.Data[0] = code & ((1 << bits) - 1)
+        elif asp.s_Type == L_ASYNC.TTL_INP:
+            asp.Data[0] = device.ttl
+        elif asp.s_Type == L_ASYNC.TTL_OUT:
+            device.ttl = asp.Data[0] & 0xFFFF
+        elif asp.s_Type not in set(L_ASYNC):
+            return L_ERROR.NOT_SUPPORTED
+
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def GetParameter(self, device: _Device, name: int, param: _Pointer[c_uint]) -> int:
+        if L_USER_BASE <= name < L_USER_BASE + 128:
+            param[0] = device.params[name - L_USER_BASE]
+            return L_ERROR.SUCCESS
+
+        buffer = device.buffers.get(L_STREAM.ADC)
+        values = {L_BOARD_TYPE: device.board,
+                  L_POINT_SIZE: 2,
+                  L_SYNC_ADDR_LO: addressof(device.sync) & 0xFFFFFFFF,
+                  L_SYNC_ADDR_HI: addressof(device.sync) >> 32,
+                  L_DATA_ADDR_LO: addressof(buffer) & 0xFFFFFFFF if buffer else 0,
+                  L_DATA_ADDR_HI: addressof(buffer) >> 32 if buffer else 0}
+        if name not in values:
+            return L_ERROR.NOT_SUPPORTED
+
+        param[0] = values[name]
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def SetParameter(self, device: _Device, name: int, param: _Pointer[c_uint]) -> int:
+        if not L_USER_BASE <= name < L_USER_BASE + 128:
+            return L_ERROR.NOT_SUPPORTED
+
+        device.params[name - L_USER_BASE] = param[0]
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def EnableFlashWrite(self, device: _Device, flag: int) -> int:
+        device.flash_write = bool(flag)
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def SendCommand(self, device: _Device, cmd: int) -> int:
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def SetLDeviceEvent(self, device: _Device, event: int | None, event_id: int) -> int:
+        return L_ERROR.NOT_SUPPORTED
+
+    @_entry
+    def GetWord_DM(self, device: _Device, address: int, data: _Pointer[c_ushort]) -> int:
+        data[0] = device.dm[address]
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def GetWord_PM(self, device: _Device, address: int, data: _Pointer[c_uint]) -> int:
+        data[0] = device.pm[address]
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def PutWord_DM(self, device: _Device, address: int, data: int) -> int:
+        device.dm[address] = data
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def PutWord_PM(self, device: _Device, address: int, data: int) -> int:
+        device.pm[address] = data
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def GetArray_DM(self, device: _Device, address: int, count: int,
+                    data: _Pointer[c_ushort]) -> int:
+        memmove(data, addressof(device.dm) + address * 2, count * 2)
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def GetArray_PM(self, device: _Device, address: int, count: int,
+                    data: _Pointer[c_uint]) -> int:
+        memmove(data, addressof(device.pm) + address * 4, count * 4)
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def PutArray_DM(self, device: _Device, address: int, count: int,
+                    data: _Pointer[c_ushort]) -> int:
+        memmove(addressof(device.dm) + address * 2, data, count * 2)
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def PutArray_PM(self, device: _Device, address: int, count: int,
+                    data: _Pointer[c_uint]) -> int:
+        memmove(addressof(device.pm) + address * 4, data, count * 4)
+        return L_ERROR.SUCCESS
+
+# Функции для работы с портами ввода/вывода плат
+
+    @staticmethod
+    def _read(space: object, offset: int, data: _Pointer[c_ubyte], length: int) -> int:
+        if offset + length > sizeof(space):
+            return L_ERROR.ERROR
+
+        memmove(data, addressof(space) + offset, length)
+        return L_ERROR.SUCCESS
+
+    @staticmethod
+    def _write(space: object, offset: int, data: _Pointer[c_ubyte], length: int) -> int:
+        if offset + length > sizeof(space):
+            return L_ERROR.ERROR
+
+        memmove(addressof(space) + offset, data, length)
+        return L_ERROR.SUCCESS
+
+    @_entry
+    def inbyte(self, device: _Device, offset: int, data: _Pointer[c_ubyte], length: int,
+               key: int) -> int:
+        return self._read(device.ports, offset, data, length)
+
+    @_entry
+    def inword(self, device: _Device, offset: int, data: _Pointer[c_ushort], length: int,
+               key: int) -> int:
+        return self._read(device.ports, offset, data, length)
+
+    @_entry
+    def indword(self, device: _Device, offset: int, data: _Pointer[c_uint], length: int,
+                key: int) -> int:
+        return self._read(device.ports, offset, data, length)
+
+    @_entry
+    def inmbyte(self, device: _Device, offset: int, data: _Pointer[c_ubyte], length: int,
+                key: int) -> int:
+        return self._read(device.memory, offset, data, length)
+
+    @_entry
+    def inmword(self, device: _Device, offset: int, data: _Pointer[c_ushort], length: int,
+                key: int) -> int:
+        return self._read(device.memory, offset, data, length)
+
+    @_entry
+    def inmdword(self, device: _Device, offset: int, data: _Pointer[c_uint], length: int,
+                 key: int) -> int:
+        return self._read(device.memory, offset, data, length)
+
+    @_entry
+    def outbyte(self, device: _Device, offset: int, data: _Pointer[c_ubyte], length: int,
+                key: int) -> int:
+        return self._write(device.ports, offset, data, length)
+
+    @_entry
+    def outword(self, device: _Device, offset: int, data: _Pointer[c_ushort], length: int,
+                key: int) -> int:
+        return self._write(device.ports, offset, data, length)
+
+    @_entry
+    def outdword(self, device: _Device, offset: int, data: _Pointer[c_uint], length: int,
+                 key: int) -> int:
+        return self._write(device.ports, offset, data, length)
+
+    @_entry
+    def outmbyte(self, device: _Device, offset: int, data: _Pointer[c_ubyte], length: int,
+                 key: int) -> int:
+        return self._write(device.memory, offset, data, length)
+
+    @_entry
+    def outmword(self, device: _Device, offset: int, data: _Pointer[c_ushort], length: int,
+                 key: int) -> int:
+        return self._write(device.memory, offset, data, length)
+
+    @_entry
+    def outmdword(self, device: _Device, offset: int, data: _Pointer[c_uint], length: int,
+                  key: int) -> int:
+        return self._write(device.memory, offset, data, length)
+
+# Расширенный интерфейс для работы с устройствами
+
+    def Get_LDEV2_Interface(self, ifc: int | None, err: _Pointer[c_uint]) -> int | None:
+        # расширенный интерфейс модели совпадает с основным
+        if (ifc or 0) not in self._devices:
+            err[0] = L_ERROR.NO_BOARD
+            return None
+
+        err[0] = L_ERROR.SUCCESS
+        return ifc
+
+    @_entry
+    def Release_LDEV2_Interface(self, device: _Device) -> int:
+        return L_ERROR.SUCCESS
+
+    def InitStartLDeviceEx(self, ifc: int | None, stream_id: int) -> int:
+        if stream_id != L_STREAM.ADC:
+            return L_ERROR.NOT_SUPPORTED
+        return self.InitStartLDevice(ifc)
+
+    def StartLDeviceEx(self, ifc: int | None, stream_id: int) -> int:
+        if stream_id != L_STREAM.ADC:
+            return L_ERROR.NOT_SUPPORTED
+        return self.StartLDevice(ifc)
+
+    def StopLDeviceEx(self, ifc: int | None, stream_id: int) -> int:
+        if stream_id != L_STREAM.ADC:
+            return L_ERROR.NOT_SUPPORTED
+        return self.StopLDevice(ifc)
+
+
+__all__ = ["Simulator"]
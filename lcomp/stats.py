@@ -0,0 +1,132 @@
+#! /usr/bin/env python3
+
+"""Накопление статистики каналов по потоку порций."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from numpy import (asarray, count_nonzero, einsum, float32, float64, full, inf, int64, integer,
+                   maximum, minimum, ones, sqrt, zeros)
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+
+class ChannelStats:
+    """Минимум, максимум, среднее, СКЗ и число перегрузок по каналам.
+
+    Принимает порции (канал, кадр) в вольтах или в кодах АЦП (например,
+    результат Converter.codes) и хранит только суммы, поэтому статистики
+    за разные интервалы объединяются сложением (merge или +=). Для кодов
+    можно передать offset и scale каналов, тогда результаты выдаются в
+    вольтах. limit - порог перегрузки в единицах входных данных; отсчеты
+    считаются только для каналов, у которых минимум или максимум порции
+    вышел за порог.
+    """
+
+    def __init__(self, channels: int, limit: float | None = None,
+                 offset: ArrayLike | None = None, scale: ArrayLike | None = None) -> None:
+        """Инициализация накопителя для channels каналов."""
+
+        self.channels = channels
+        self.limit = limit
+        self.offset = zeros(channels) if offset is None else asarray(offset, dtype=float64)
+        self.scale = ones(channels) if scale is None else asarray(scale, dtype=float64)
+        self.reset()
+
+    def reset(self) -> None:
+        """Сброс накопленных значений."""
+
+        self.count = 0
+        self.minimum = full(self.channels, inf)
+        self.maximum = full(self.channels, -inf)
+        self.total = zeros(self.channels, dtype=float64)
+        self.squares = zeros(self.channels, dtype=float64)
+        self.overload = zeros(self.channels, dtype=int64)
+
+    def update(self, block: ArrayLike) -> None:
+        """Учет порции (канал, кадр)."""
+
+        block = asarray(block)
+        if not block.shape[1]:
+            return
+
+        low, high = block.min(axis=1), block.max(axis=1)
+        minimum(self.minimum, low, out=self.minimum)
+        maximum(self.maximum, high, out=self.maximum)
+
+        if issubclass(block.dtype.type, integer):
+            self.total += block.sum(axis=1, dtype=int64)
+            self.squares += einsum("ij,ij->i", block, block, dtype=int64, casting="unsafe")
+        else:
+            self.total += block.sum(axis=1, dtype=float64)
+            self.squares += einsum("ij,ij->i", block, block)       # float32 внутри порции
+
+        if self.limit is not None:
+            for channel in ((low < -self.limit) | (high > self.limit)).nonzero()[0]:
+                row = block[channel]
+                self.overload[channel] += count_nonzero(row > self.limit) + \
+                    count_nonzero(row < -self.limit)
+
+        self.count += block.shape[1]
+
+    def merge(self, other: ChannelStats) -> ChannelStats:
+        """Добавление статистики другого интервала тех же каналов."""
+
+        self.count += other.count
+        minimum(self.minimum, other.minimum, out=self.minimum)
+        maximum(self.maximum, other.maximum, out=self.maximum)
+        self.total += other.total
+        self.squares += other.squares
+        self.overload += other.overload
+        return self
+
+    def __iadd__(self, other: ChannelStats) -> ChannelStats:
+        return self.merge(other)
+
+    @property
+    def mean(self) -> NDArray[float64]:
+        """Среднее значение каналов."""
+
+        mean = self.total / self.count if self.count else zeros(self.channels)
+        return (mean + self.offset) * self.scale
+
+    @property
+    def rms(self) -> NDArray[float64]:
+        """Среднеквадратичное значение каналов (с учетом постоянной составляющей)."""
+
+        if not self.count:
+            return zeros(self.channels)
+
+        # E[(x + offset)^2] = E[x^2] + 2 * offset * E[x] + offset^2
+        power = self.squares / self.count + 2 * self.offset * self.total / self.count + \
+            self.offset ** 2
+        return sqrt(maximum(power, 0.0)) * abs(self.scale)
+
+    @property
+    def low(self) -> NDArray[float64]:
+        """Минимальное значение каналов."""
+
+        return minimum((self.minimum + self.offset) * self.scale,
+                       (self.maximum + self.offset) * self.scale)
+
+    @property
+    def high(self) -> NDArray[float64]:
+        """Максимальное значение каналов."""
+
+        return maximum((self.minimum + self.offset) * self.scale,
+                       (self.maximum + self.offset) * self.scale)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Текущие значения в виде словаря списков по каналам."""
+
+        return {"count": self.count,
+                "min": self.low.astype(float32).tolist(),
+                "max": self.high.astype(float32).tolist(),
+                "mean": self.mean.astype(float32).tolist(),
+                "rms": self.rms.astype(float32).tolist(),
+                "overload": self.overload.tolist()}
+
+
+__all__ = ["ChannelStats"]
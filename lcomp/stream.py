@@ -0,0 +1,295 @@
+#! /usr/bin/env python3
+
+"""Потоковое чтение большого кольцевого буфера АЦП."""
+
+from __future__ import annotations
+
+import logging
+import os
+import time
+from ctypes import POINTER, Structure, _Pointer, c_uint, c_ushort, c_void_p, cast
+from typing import TYPE_CHECKING, Callable, Iterator
+
+from numpy import frombuffer, int16
+
+from lcomp.ioctl import L_EVENT
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from lcomp.lcomp import LCOMP
+
+if os.name == "nt":
+    from ctypes import windll
+
+    _kernel32 = windll.kernel32
+    _kernel32.CreateEventW.restype = c_void_p
+    _kernel32.WaitForSingleObject.argtypes = (c_void_p, c_uint)
+    _kernel32.CloseHandle.argtypes = (c_void_p,)
+
+_logger = logging.getLogger(__name__)
+_logger.addHandler(logging.NullHandler())
+
+_INFINITE = 0xFFFFFFFF
+_MIN_SLEEP = 0.0002         # меньшие задержки sleep все равно не выдерживает
+
+
+def sample_rate(daqpar: Structure) -> float:
+    """Частота поступления отсчетов АЦП в буфер (отсчетов в секунду).
+
+    Кадр из NCh отсчетов занимает (NCh - 1) / dRate + dKadr миллисекунд,
+    но не меньше NCh / dRate.
+    """
+
+    if daqpar.dRate <= 0 or not daqpar.NCh:
+        return 0.0
+
+    frame = max((daqpar.NCh - 1) / daqpar.dRate + daqpar.dKadr, daqpar.NCh / daqpar.dRate)
+    return daqpar.NCh * 1000.0 / frame
+
+
+class BufferEvent:
+    """Событие драйвера о заполнении буфера АЦП (L_EVENT.ADC_BUF).
+
+    Событие регистрируется через SetLDeviceEvent до StartLDevice. Драйвер
+    сигнализирует его только при однократном заполнении буфера и только
+    под Windows, в остальных случаях supported равно False и ожидание
+    выполняется опросом счетчика sync.
+    """
+
+    def __init__(self, ldev: LCOMP) -> None:
+        """Создание события и регистрация его в драйвере."""
+
+        from lcomp.lcomp import LcompError
+
+        self._handle = None
+        if os.name != "nt":
+            return
+
+        handle = _kernel32.CreateEventW(None, False, False, None)
+        try:
+            registered = ldev.SetLDeviceEvent(handle, L_EVENT.ADC_BUF)
+        except LcompError:
+            registered = False
+
+        if registered:
+            self._handle = handle
+        else:
+            _kernel32.CloseHandle(handle)
+
+    @property
+    def supported(self) -> bool:
+        """Драйвер принял событие."""
+
+        return self._handle is not None
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Ожидание события не дольше timeout секунд."""
+
+        if self._handle is None:
+            return False
+
+        msec = _INFINITE if timeout is None else int(timeout * 1000)
+        return _kernel32.WaitForSingleObject(self._handle, msec) == 0
+
+    def close(self) -> None:
+        """Освобождение события."""
+
+        if self._handle is not None:
+            _kernel32.CloseHandle(self._handle)
+            self._handle = None
+
+
+class StreamReader:
+    """Чтение кольцевого буфера по мере его заполнения платой.
+
+    Буфер и счетчик sync берутся из результата LCOMP.SetParametersStream.
+    Каждая новая порция данных возвращается кортежем из одного или двух
+    представлений numpy (без копирования) - два представления получаются,
+    когда порция переходит через конец кольца. При aligned=True порции
+    выдаются кратными IrqStep, то есть целыми страницами буфера.
+
+    Ожидание данных не занимает процессор: используется событие драйвера,
+    если оно передано и поддерживается, иначе опрос sync с паузами,
+    рассчитанными по частоте сбора. interval ограничивает паузу сверху.
+
+    В циклическом режиме по sync и времени между опросами (с частотой
+    сбора) ведется оценка числа отсчетов, записанных платой. Если
+    непрочитанных отсчетов больше размера кольца, плата затерла данные:
+    чтение продолжается с текущей страницы платы, пропущенные отсчеты
+    добавляются к lost и к position, поэтому номера порций показывают
+    разрыв. Переполнение до первого опроса после запуска сбора не
+    обнаруживается. Для счетчика из SetParametersStream учитывается только
+    время, когда сбор был запущен (StartLDevice/StopLDevice), для
+    произвольной функции syncd - все время между опросами.
+    """
+
+    def __init__(self, daqpar: Structure, address: _Pointer[c_ushort],
+                 syncd: Callable[[], int], size: int, aligned: bool = False,
+                 interval: float = 0.05, event: BufferEvent | None = None) -> None:
+        """Инициализация чтения буфера с параметрами после SetParametersStream."""
+
+        if daqpar.Pages and daqpar.IrqStep:
+            size = min(size, daqpar.Pages * daqpar.IrqStep)
+
+        self._ring = frombuffer(cast(address, POINTER(c_ushort * size))[0], int16)
+        self._syncd = syncd
+        self._running: Callable[[float, float], float] | None = getattr(syncd, "running", None)
+        self._size = size
+        self._cyclic = bool(daqpar.AutoInit)
+        self._step = daqpar.IrqStep if aligned and daqpar.IrqStep else 1
+        self._rate = sample_rate(daqpar)
+        self._interval = interval
+        self._event = event if event is not None and event.supported else None
+        self._last = 0
+        self._sync = 0          # sync при последнем опросе
+        self._time = 0.0        # время последнего опроса
+        self._written = 0       # оценка общего числа записанных платой отсчетов
+
+        self.position = 0       # номер следующего отсчета потока (с учетом пропущенных)
+        self.lost = 0           # отсчетов затерто платой до чтения
+
+    @property
+    def size(self) -> int:
+        """Размер кольцевого буфера в отсчетах."""
+
+        return self._size
+
+    @property
+    def step(self) -> int:
+        """Кратность выдаваемых порций в отсчетах."""
+
+        return self._step
+
+    @property
+    def finished(self) -> bool:
+        """Однократный сбор завершен и все данные прочитаны."""
+
+        return not self._cyclic and self.position >= self._size
+
+    def available(self) -> int:
+        """Количество заполненных, но еще не прочитанных отсчетов."""
+
+        sync = self._syncd()
+        if self._cyclic:
+            count = self._track(sync)
+        else:
+            count = min(sync, self._size) - self._last
+
+        return count - count % self._step
+
+    def _track(self, sync: int) -> int:
+        # sync показывает положение платы только по модулю размера кольца,
+        # число полных оборотов между опросами оценивается по времени
+        now = time.perf_counter()
+        delta = (sync - self._sync) % self._size
+        if self._written and self._rate:
+            if self._running is not None:
+                elapsed = self._running(self._time, now)
+            else:
+                elapsed = now - self._time
+            laps = round((elapsed * self._rate - delta) / self._size)
+            delta += max(laps, 0) * self._size
+        self._sync, self._time = sync, now
+        self._written += delta
+
+        count = self._written - self.position
+        if count >= self._size:
+            partial = sync % self._step
+            skipped = count - partial
+            self.lost += skipped
+            self.position += skipped
+            self._last = sync - partial
+            _logger.warning("Ring buffer overrun, %d samples lost", skipped)
+            count = partial
+
+        return count
+
+    def intact(self, count: int) -> bool:
+        """Проверка, что последняя порция из count отсчетов не затерта платой.
+
+        Представления, возвращенные read, действительны, пока плата не
+        запишет поверх них новые данные, поэтому проверка выполняется после
+        копирования порции. Затертая порция добавляется к lost.
+        """
+
+        if not self._cyclic:
+            return True
+
+        lost = self.lost
+        unread = self._track(self._syncd())
+        if self.lost == lost and unread + count <= self._size:
+            return True
+
+        self.lost += count
+        _logger.warning("Block overwritten while copying, %d samples lost", count)
+        return False
+
+    def read(self, count: int | None = None) -> tuple[NDArray[int16], ...]:
+        """Возвращает новую порцию данных (не более count отсчетов)."""
+
+        available = self.available()
+        if count is not None and count < available:
+            available = count - count % self._step
+        if not available:
+            return ()
+
+        start = self._last
+        stop = start + available
+        if stop <= self._size:
+            regions: tuple[NDArray[int16], ...] = (self._ring[start:stop],)
+        else:
+            regions = (self._ring[start:], self._ring[:stop - self._size])
+
+        self._last = stop % self._size if self._cyclic else stop
+        self.position += available
+        return regions
+
+    def wait_for(self, samples: int, timeout: float | None = None) -> bool:
+        """Ожидание, пока станет доступно не менее samples отсчетов.
+
+        Возвращает False, если за timeout секунд данных не набралось. В
+        циклическом режиме непрочитанных отсчетов не бывает больше
+        (size - 1) с округлением вниз до step, поэтому samples ограничивается
+        этим значением.
+        """
+
+        samples = max(samples, self._step)
+        if self._cyclic:
+            samples = min(samples, (self._size - 1) // self._step * self._step)
+        else:
+            samples = min(samples, self._size - self.position)
+            if samples <= 0:
+                return True
+
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        if self._event is not None and not self._cyclic and \
+                self.position + samples >= self._size and self.available() < samples:
+            self._event.wait(timeout)
+
+        delay = _MIN_SLEEP
+        while (available := self.available()) < samples:
+            if self._rate:
+                delay = (samples - available) / self._rate / 2
+            else:
+                delay *= 2
+
+            if deadline is not None:
+                left = deadline - time.perf_counter()
+                if left <= 0:
+                    return False
+                delay = min(delay, left)
+
+            time.sleep(min(max(delay, _MIN_SLEEP), self._interval))
+
+        return True
+
+    def __iter__(self) -> Iterator[tuple[NDArray[int16], ...]]:
+        """Бесконечный (для AutoInit=1) перебор новых порций данных."""
+
+        while not self.finished:
+            if self.wait_for(self._step, self._interval):
+                yield self.read()
+
+
+__all__ = ["BufferEvent", "StreamReader", "sample_rate"]
@@ -0,0 +1,175 @@
+#! /usr/bin/env python3
+
+"""Программный запуск по сигналу канала с записью предыстории."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import IntEnum
+from math import ceil, floor
+from typing import TYPE_CHECKING
+
+from numpy import concatenate, empty, float32, int16, int32
+
+if TYPE_CHECKING:
+    from numpy.typing import ArrayLike, NDArray
+
+    from lcomp.device.converter import Converter
+
+
+_CODE_MIN, _CODE_MAX = -32768, 32767
+
+
+class L_TRIGGER(IntEnum):
+    """Условия запуска."""
+
+    EDGE_UP = 0         # переход уровня снизу вверх
+    EDGE_DOWN = 1       # переход уровня сверху вниз
+    WINDOW_OUT = 2      # выход из окна [level, high]
+    WINDOW_IN = 3       # вход в окно [level, high]
+    SLOPE = 4           # изменение за span кадров не меньше level (не больше при level < 0)
+
+
+@dataclass
+class TriggerEvent:
+    """Зарегистрированное событие."""
+
+    index: int                  # номер кадра запуска от начала потока
+    data: NDArray[int16]        # коды (канал, кадр) с index - pre по index + post
+    pre: int                    # кадров предыстории в data
+
+    @property
+    def start(self) -> int:
+        """Номер первого кадра записи от начала потока."""
+
+        return self.index - self.pre
+
+
+class Trigger:
+    """Поиск событий в потоке порций кодов АЦП.
+
+    Порции чередующихся отсчетов (как в кольцевом буфере) разбираются
+    переданным преобразователем в коды (канал, кадр) без перевода в
+    вольты, условие проверяется векторно на кодах канала channel, пороги
+    переводятся в коды по калибровке канала один раз. Последние pre кадров
+    хранятся, поэтому событие записывается вместе с предысторией; запись
+    выдается, когда набрано post кадров после запуска. Следующий запуск
+    возможен не раньше чем через holdoff кадров (по умолчанию post).
+    Запуски в первые pre кадров потока пропускаются. Преобразователь
+    хранит неполный кадр и должен использоваться только этим объектом.
+    """
+
+    def __init__(self, converter: Converter, channel: int, kind: L_TRIGGER, level: float,
+                 high: float | None = None, span: int = 1, pre: int = 1000, post: int = 1000,
+                 holdoff: int | None = None) -> None:
+        """Настройка условия: уровни level/high в вольтах, channel - логический канал."""
+
+        self._converter = converter
+        self._row = converter.selected.tolist().index(channel)
+        self._kind = kind
+        self._span = span if kind == L_TRIGGER.SLOPE else 0
+        self._pre = pre
+        self._post = post
+        self._holdoff = post if holdoff is None else holdoff
+
+        offset = float(converter.offset[self._row])
+        scale = float(converter.scale[self._row])
+        if kind == L_TRIGGER.SLOPE:
+            self._low = self._code(level / scale, level >= 0)
+        else:
+            self._low = self._code(level / scale - offset, kind != L_TRIGGER.EDGE_DOWN)
+        if kind in (L_TRIGGER.WINDOW_OUT, L_TRIGGER.WINDOW_IN):
+            if high is None:
+                raise ValueError("window trigger requires high level")
+            self._high = self._code(high / scale - offset, False)
+
+        self._buffer = empty((converter.selected.size, 0), dtype=int16)
+        self._base = 0          # номер кадра начала буфера
+        self._next = pre        # ближайший кадр, с которого разрешен запуск
+        self._pending: list[int] = []
+
+    @staticmethod
+    def _code(value: float, up: bool) -> int:
+        # целочисленный порог, эквивалентный сравнению в вольтах
+        code = ceil(value) if up else floor(value)
+        return min(max(code, _CODE_MIN), _CODE_MAX)
+
+    @property
+    def position(self) -> int:
+        """Количество обработанных кадров."""
+
+        return self._base + self._buffer.shape[1]
+
+    def _condition(self, x: NDArray[int16]) -> NDArray[bool]:
+        kind = self._kind
+        if kind == L_TRIGGER.EDGE_UP:
+            return x >= self._low
+        if kind == L_TRIGGER.EDGE_DOWN:
+            return x <= self._low
+        if kind == L_TRIGGER.SLOPE:
+            delta = x[self._span:].astype(int32)
+            delta -= x[:-self._span]
+            return delta >= self._low if self._low >= 0 else delta <= self._low
+
+        inside = (x >= self._low) & (x <= self._high)
+        return ~inside if kind == L_TRIGGER.WINDOW_OUT else inside
+
+    def _quiet(self, x: NDArray[int16]) -> bool:
+        # порция без запусков по уровню определяется одной редукцией
+        if self._kind == L_TRIGGER.EDGE_UP:
+            return bool(x.max() < self._low)
+        if self._kind == L_TRIGGER.EDGE_DOWN:
+            return bool(x.min() > self._low)
+        return False
+
+    def _scan(self, fresh: int) -> list[int]:
+        row = self._buffer[self._row]
+        context = self._span + 1            # кадров, нужных для проверки первого нового
+        start = max(row.size - fresh - context, 0)
+        x = row[start:]
+        if x.size < context + 1 or self._quiet(x):
+            return []
+
+        state = self._condition(x)
+        hits = (~state[:-1] & state[1:]).nonzero()[0] + 1 + self._span
+        first = row.size - fresh - start
+        return [self._base + start + int(hit) for hit in hits if hit >= first]
+
+    def __call__(self, data: ArrayLike) -> list[TriggerEvent]:
+        """Обработка порции, возвращает события, для которых набрано post кадров."""
+
+        codes, _, _ = self._converter.codes(data)
+        if not codes.shape[1]:
+            return []
+
+        self._buffer = concatenate((self._buffer, codes), axis=1)
+        for index in self._scan(codes.shape[1]):
+            if index >= self._next:
+                self._pending.append(index)
+                self._next = index + max(self._holdoff, 1)
+
+        end = self.position
+        events = []
+        while self._pending and self._pending[0] + self._post <= end:
+            index = self._pending.pop(0)
+            first = index - self._pre - self._base
+            events.append(TriggerEvent(index, self._buffer[:, first:first + self._pre + self._post]
+                                       .copy(), self._pre))
+
+        keep = end - max(self._pre, self._span + 1)
+        if self._pending:
+            keep = min(keep, self._pending[0] - self._pre)
+        if keep > self._base:
+            self._buffer = self._buffer[:, keep - self._base:]
+            self._base = keep
+
+        return events
+
+    def volts(self, event: TriggerEvent) -> NDArray[float32]:
+        """Перевод записи события в вольты по калибровке преобразователя."""
+
+        return ((event.data + self._converter.offset[:, None])
+                * self._converter.scale[:, None]).astype(float32)
+
+
+__all__ = ["L_TRIGGER", "Trigger", "TriggerEvent"]
@@ -0,0 +1,191 @@
+#! /usr/bin/env python3
+
+"""Фоновый поток сбора данных с очередью ограниченного размера."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from enum import IntEnum
+from typing import TYPE_CHECKING, Iterator
+
+from numpy import empty, int16
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+    from lcomp.lcomp import LCOMP
+    from lcomp.stream import StreamReader
+
+
+class L_OVERRUN(IntEnum):
+    """Поведение при заполнении очереди порций."""
+
+    BLOCK = 0           # ждать освобождения места (затертые в кольце драйвера отсчеты учитываются в lost)
+    DROP_OLDEST = 1     # вытеснить самую старую порцию из очереди
+    DROP_NEWEST = 2     # отбросить новую порцию
+
+
+class AcquisitionWorker(threading.Thread):
+    """Поток, переносящий порции кольцевого буфера в очередь потребителя.
+
+    Очередь состоит из заранее выделенных ячеек по block_size отсчетов, при
+    чтении данные копируются из кольца драйвера в свободную ячейку. Каждая
+    порция сопровождается номером ее первого отсчета в потоке, поэтому
+    пропуски видны и потребителю. Ячейка занимается до чтения кольца, а
+    после копирования проверяется, что плата не записала поверх порции,
+    испорченная порция отбрасывается. Число потерянных отсчетов -
+    отброшенных по политике policy (dropped) и затертых платой в кольце
+    драйвера, пока поток ждал места в очереди (overrun), - выдается
+    свойством lost.
+
+    Если передан ldev, поток сам вызывает InitStartLDevice/StartLDevice
+    при запуске и StopLDevice при остановке.
+    """
+
+    def __init__(self, reader: StreamReader, block_size: int, capacity: int = 16,
+                 policy: L_OVERRUN = L_OVERRUN.BLOCK, ldev: LCOMP | None = None,
+                 interval: float = 0.05) -> None:
+        """Выделение ячеек очереди под capacity порций."""
+
+        super().__init__(name="lcomp-worker", daemon=True)
+
+        self._reader = reader
+        self._block = block_size - block_size % reader.step or reader.step
+        self._policy = policy
+        self._ldev = ldev
+        self._interval = interval
+
+        self._slots = empty((capacity + 1, self._block), dtype=int16)   # +1 ячейка у потребителя
+        self._free = deque(range(capacity + 1))
+        self._ready: deque[tuple[int, int, int]] = deque()             # (ячейка, номер, длина)
+        self._taken: int | None = None
+        self._cond = threading.Condition()
+        self._halt = threading.Event()
+        self._done = False
+
+        self.error: BaseException | None = None
+        self.samples = 0        # отсчетов помещено в очередь
+        self.dropped = 0        # отсчетов отброшено при переполнении очереди
+
+    def _slot(self) -> int | None:
+        """Свободная ячейка с учетом политики переполнения."""
+
+        with self._cond:
+            while not self._free:
+                if self._policy == L_OVERRUN.DROP_NEWEST:
+                    return None
+                if self._policy == L_OVERRUN.DROP_OLDEST:
+                    slot, _, length = self._ready.popleft()
+                    self.dropped += length
+                    return slot
+                if self._halt.is_set():
+                    return None
+                self._cond.wait(self._interval)
+            return self._free.popleft()
+
+    def run(self) -> None:
+        reader = self._reader
+        try:
+            if self._ldev is not None:
+                self._ldev.InitStartLDevice()
+                self._ldev.StartLDevice()
+
+            while not self._halt.is_set() and not reader.finished:
+                if not reader.wait_for(self._block, self._interval):
+                    continue
+
+                # ячейка занимается до чтения: представления кольца должны
+                # быть скопированы сразу, пока плата не записала поверх них
+                slot = self._slot()
+                if slot is None and self._halt.is_set():
+                    break
+
+                index = reader.position
+                regions = reader.read(self._block)
+                count = sum(region.size for region in regions)
+                if slot is None:
+                    self.dropped += count
+                    continue
+
+                pos = 0
+                for region in regions:
+                    self._slots[slot, pos:pos + region.size] = region
+                    pos += region.size
+
+                intact = bool(count) and reader.intact(count)
+                with self._cond:
+                    if intact:
+                        self._ready.append((slot, index, count))
+                        self.samples += count
+                    else:
+                        self._free.appendleft(slot)
+                    self._cond.notify_all()
+        except BaseException as err:
+            self.error = err
+        finally:
+            if self._ldev is not None:
+                self._ldev.StopLDevice()
+            with self._cond:
+                self._done = True
+                self._cond.notify_all()
+
+    def stop(self) -> None:
+        """Остановка потока сбора."""
+
+        self._halt.set()
+        with self._cond:
+            self._cond.notify_all()
+        if self.is_alive():
+            self.join()
+
+    @property
+    def overrun(self) -> int:
+        """Количество отсчетов, затертых платой в кольце драйвера до чтения."""
+
+        return self._reader.lost
+
+    @property
+    def lost(self) -> int:
+        """Общее количество потерянных отсчетов."""
+
+        return self.dropped + self._reader.lost
+
+    @property
+    def pending(self) -> int:
+        """Количество порций в очереди."""
+
+        return len(self._ready)
+
+    def get(self, timeout: float | None = None) -> tuple[int, NDArray[int16]] | None:
+        """Следующая порция: номер первого отсчета и данные.
+
+        Данные остаются действительными до следующего вызова get. Возвращает
+        None, если за timeout секунд данных не поступило или сбор окончен.
+        """
+
+        with self._cond:
+            if self._taken is not None:
+                self._free.append(self._taken)
+                self._taken = None
+                self._cond.notify_all()
+
+            if not self._cond.wait_for(lambda: self._ready or self._done, timeout):
+                return None
+            if not self._ready:
+                if self.error is not None:
+                    raise self.error
+                return None
+
+            slot, index, count = self._ready.popleft()
+            self._taken = slot
+            return index, self._slots[slot, :count]
+
+    def __iter__(self) -> Iterator[tuple[int, NDArray[int16]]]:
+        """Перебор порций до окончания сбора."""
+
+        while (item := self.get()) is not None:
+            yield item
+
+
+__all__ = ["AcquisitionWorker", "L_OVERRUN"]
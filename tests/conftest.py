@@ -0,0 +1,59 @@
+"""Общие средства тестов: модель плат вместо библиотек wlcomp/lcomp."""
+
+from __future__ import annotations
+
+import os
+
+# модель выбирается при первом обращении к устройству, до импорта тестов
+os.environ["LCOMP_SIMULATOR"] = "E140,E154,E2010B,E440"
+
+from typing import TYPE_CHECKING, Iterator
+
+import pytest
+from numpy import arange, uint16
+
+from lcomp.ioctl import L_PARAM, L_STREAM, WDAQ_PAR
+from lcomp.lcomp import LCOMP, _libraries
+
+if TYPE_CHECKING:
+    from ctypes import Structure
+
+    from numpy.typing import NDArray
+
+
+@pytest.fixture
+def ldev() -> Iterator[LCOMP]:
+    """Открытый модуль E14-140 в слоте 0."""
+
+    with LCOMP(0) as device:
+        yield device
+
+
+def setup_stream(ldev: LCOMP, nch: int = 3, size: int = 65536, rate: float = 400.0,
+                 autoinit: int = 1, step: int = 4096) -> tuple[Structure, object, object, int]:
+    """Настройка потокового сбора: параметры, буфер, счетчик sync и размер кольца."""
+
+    size = ldev.RequestBufferStream(size=size, stream_id=L_STREAM.ADC)
+    adcpar = WDAQ_PAR().t3
+    adcpar.s_Type = L_PARAM.ADC
+    adcpar.FIFO = adcpar.IrqStep = step
+    adcpar.Pages = size // step
+    adcpar.AutoInit = autoinit
+    adcpar.dRate = rate
+    adcpar.dKadr = 1 / rate
+    adcpar.NCh = nch
+    for ch in range(nch):
+        adcpar.Chn[ch] = ch
+    adcpar.IrqEna = adcpar.AdcEna = 1
+
+    ldev.FillDAQparameters(adcpar)
+    address, syncd = ldev.SetParametersStream(adcpar, size)
+    return adcpar, address, syncd, size
+
+
+def expected(ldev: LCOMP, index: int, count: int) -> NDArray[uint16]:
+    """Отсчеты, которые модель записывает в поток начиная с номера index."""
+
+    device = _libraries()[0]._devices[ldev._ifc.value]
+    period = device.pattern[:device.pattern.size // 2]
+    return period.take(arange(index, index + count), mode="wrap")
@@ -0,0 +1,56 @@
+"""Кэш описателей плат и образ Flash модели."""
+
+from __future__ import annotations
+
+import pytest
+
+from lcomp.cache import DescrCache
+from lcomp.ioctl import L_DEVICE
+from lcomp.lcomp import LCOMP
+from lcomp.simulator import _flash_image, _plata_descr, _unpack_descr
+
+
+@pytest.mark.parametrize("board", [L_DEVICE.E140, L_DEVICE.E154, L_DEVICE.E2010])
+def test_flash_image_round_trip(board: L_DEVICE) -> None:
+    descr = _plata_descr(board, 0)
+    assert bytes(_unpack_descr(board, _flash_image(board, descr)))[:128] == bytes(descr)[:128]
+
+
+@pytest.mark.parametrize("slot", [0, 1, 2])      # E140, E154, E2010B
+def test_cache_hit(tmp_path, monkeypatch, slot: int) -> None:
+    cache = DescrCache(tmp_path)
+    with LCOMP(slot) as ldev:
+        first = cache.read(ldev)
+        assert bytes(first) == bytes(ldev.ReadPlataDescr())
+
+        reads = []
+        monkeypatch.setattr(ldev, "ReadPlataDescr", lambda: pytest.fail("descriptor reread"))
+        original = ldev.ReadFlashWord
+        monkeypatch.setattr(ldev, "ReadFlashWord", lambda address: reads.append(address)
+                            or original(address))
+        assert bytes(cache.read(ldev)) == bytes(first)
+        assert len(reads) <= 9
+
+
+def test_cache_detects_new_calibration(tmp_path, monkeypatch) -> None:
+    cache = DescrCache(tmp_path)
+    with LCOMP(0) as ldev:
+        descr = cache.read(ldev)
+        descr.t5.KoefADC[0] += 1.0
+
+        # запись в обход кэша (сторонней программой) меняет контрольную сумму
+        monkeypatch.setattr(LCOMP, "flash_write_hooks", [])
+        ldev.EnableFlashWrite(True)
+        ldev.WritePlataDescr(descr, True)
+
+        assert cache.read(ldev).t5.KoefADC[0] == descr.t5.KoefADC[0]
+        assert len(list(tmp_path.glob("*.bin"))) == 1
+
+
+def test_flash_write_invalidates(tmp_path) -> None:
+    cache = DescrCache(tmp_path)
+    with LCOMP(2) as ldev:
+        cache.read(ldev)
+        ldev.EnableFlashWrite(True)
+        ldev.WriteFlashWord(127, 0)
+        assert not list(tmp_path.glob("*.bin"))
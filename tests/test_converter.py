@@ -0,0 +1,144 @@
+"""Преобразователи кодов АЦП в сравнении с исходными формулами модулей."""
+
+from __future__ import annotations
+
+from ctypes import c_ushort
+
+import pytest
+from numpy import array, concatenate, float64, int16, int32
+from numpy.random import default_rng
+
+from lcomp.device import e140, e154, e440, e2010, l791
+from lcomp.device.converter import converter_class
+from lcomp.ioctl import L_DEVICE, WDAQ_PAR
+from lcomp.simulator import _plata_descr
+
+# модуль, поле описателя, диапазоны (В), смещение коэффициентов масштаба, разрядность, шкала
+_BOARDS = {
+    L_DEVICE.E140: (e140, "t5", (10.0, 2.5, 0.625, 0.15625), 4, 14, 8000.0),
+    L_DEVICE.E154: (e154, "t7", (5.0, 1.6, 0.5, 0.16), 4, 12, 2000.0),
+    L_DEVICE.E440: (e440, "t4", (10.0, 2.5, 0.625, 0.15625), 4, 14, 8000.0),
+    L_DEVICE.L791: (l791, "t3", (10.0, 5.0, 2.5, 1.25, 0.625, 0.312, 0.156, 0.078), 8, 14, 8192.0),
+}
+
+
+def _setup(board: L_DEVICE, nch: int) -> tuple[object, object, list[int]]:
+    ranges = len(_BOARDS[board][2])
+    chn = [ch | (ch % ranges) << 6 for ch in range(nch)]
+    adcpar = WDAQ_PAR().t3
+    adcpar.NCh = nch
+    adcpar.Chn[:nch] = chn
+    return adcpar, _plata_descr(board, 0), chn
+
+
+def _codes(board: L_DEVICE, size: int, seed: int = 0) -> object:
+    # коды без граничного значения -2**(bits-1) и с мусором в старших битах слова
+    bits = _BOARDS[board][4]
+    half = 1 << (bits - 1)
+    codes = default_rng(seed).integers(-half + 1, half, size).astype(int16)
+    return codes & int16((1 << bits) - 1) | int16(-0x8000)
+
+
+def _reference(board: L_DEVICE, chn: list[int], descr: object, raw: object) -> object:
+    # формула исходной функции GetDataADC модуля, без оптимизаций
+    _, part, ranges, shift, bits, scale = _BOARDS[board]
+    half = 1 << (bits - 1)
+    frames = raw.size // len(chn)
+    codes = raw[:frames * len(chn)].reshape((frames, len(chn))).T.astype(int32) & (2 * half - 1)
+    codes[codes > half] -= 2 * half
+
+    gain = (array(chn) >> 6) & (len(ranges) - 1)
+    koef = array(getattr(descr, part).KoefADC, dtype=float64)
+    offset, factor = koef[gain][:, None], koef[gain + shift][:, None]
+    return (codes + offset) * factor * array(ranges)[gain][:, None] / scale
+
+
+@pytest.mark.parametrize("board", list(_BOARDS))
+def test_converter_matches_reference(board: L_DEVICE) -> None:
+    adcpar, descr, chn = _setup(board, 5)
+    raw = _codes(board, 5 * 1000 + 3)
+    converter = converter_class(board)(adcpar, descr, on_overload=None)
+
+    volts = concatenate([converter(raw[:1001]), converter(raw[1001:4002]), converter(raw[4002:])],
+                        axis=1)
+    assert volts.shape == (5, 1000)
+    assert abs(volts - _reference(board, chn, descr, raw)).max() < 1e-5
+
+
+@pytest.mark.parametrize("board", list(_BOARDS))
+def test_codes_match_volts(board: L_DEVICE) -> None:
+    adcpar, descr, _ = _setup(board, 4)
+    raw = _codes(board, 4 * 500, seed=1)
+    module = _BOARDS[board][0]
+
+    codes, offset, scale = module.ConverterADC(adcpar, descr).codes(raw)
+    volts = module.ConverterADC(adcpar, descr)(raw)
+    assert abs((codes + offset[:, None]) * scale[:, None] - volts).max() < 1e-5
+
+
+@pytest.mark.parametrize("board, raw, code", [(L_DEVICE.E140, 0x2000, -8192),
+                                               (L_DEVICE.E154, 0x800, -2048)])
+def test_boundary_code(board: L_DEVICE, raw: int, code: int) -> None:
+    # дополнительный код: граничное значение отрицательное (прежняя GetDataADC давала +)
+    adcpar, descr, _ = _setup(board, 1)
+    codes, _, _ = converter_class(board)(adcpar, descr, on_overload=None).codes(
+        array([raw, raw | 0x4000], dtype=int16))
+    assert codes.tolist() == [[code, code]]
+
+
+def test_channel_selection() -> None:
+    adcpar, descr, _ = _setup(L_DEVICE.E140, 4)
+    raw = _codes(L_DEVICE.E140, 4 * 300 + 2)
+
+    full = e140.ConverterADC(adcpar, descr)(raw)
+    part = e140.ConverterADC(adcpar, descr, channels=[3, 1])(raw)
+    assert (part == full[[3, 1]]).all()
+
+    with pytest.raises(ValueError):
+        e140.ConverterADC(adcpar, descr, channels=[4])
+
+
+def test_overload_counters() -> None:
+    adcpar, descr, _ = _setup(L_DEVICE.E140, 2)
+    raw = array([0, 0, 8100, 0, 0, -8100, 8100, 0], dtype=int16)
+    reported = []
+    converter = e140.ConverterADC(adcpar, descr, on_overload=lambda _, rows: reported.append(rows))
+
+    converter(raw)
+    assert converter.overloads() == {0: (2, 1, 3), 1: (1, 2, 2)}
+    assert reported == [[0, 1]]
+
+
+def test_get_data_adc_keeps_tail() -> None:
+    adcpar, descr, chn = _setup(L_DEVICE.E140, 3)
+    raw = _codes(L_DEVICE.E140, 3 * 200 + 1)
+    buffer = (c_ushort * raw.size).from_buffer(raw.copy())
+
+    e140.ConverterADC.default(adcpar, descr).reset()
+    volts = concatenate([e140.GetDataADC(adcpar, descr, buffer, 301),
+                         e140.GetDataADC(adcpar, descr, (c_ushort * 300).from_buffer(buffer, 602),
+                                         300)], axis=1)
+    assert abs(volts - _reference(L_DEVICE.E140, chn, descr, raw)).max() < 1e-5
+
+
+def test_e2010_calibration() -> None:
+    adcpar = WDAQ_PAR().t4
+    adcpar.NCh = 4
+    adcpar.Chn[:4] = [e2010.CH_0, e2010.CH_1, e2010.CH_2, e2010.CH_3]
+    adcpar.AdcIMask = e2010.SIG_0 | e2010.V03_0 | e2010.SIG_1 | e2010.V10_1
+    descr = _plata_descr(L_DEVICE.E2010, 0)
+    raw = default_rng(2).integers(-8191, 8192, 4 * 250).astype(int16)
+
+    gain = array([2, 1, 0, 0])
+    koef = array(descr.t6.KoefADC, dtype=float64)
+    codes = raw.reshape((-1, 4)).T.astype(float64)
+    reference = (codes + koef[gain][:, None]) * koef[gain + 12][:, None] \
+        * array([3.0, 1.0, 0.3])[gain][:, None] / 8000.0
+
+    volts = e2010.ConverterADC(adcpar, descr, on_overload=None)(raw)
+    assert abs(volts - reference).max() < 1e-5
+
+    # калибровка применяется только к ревизии A
+    descr = _plata_descr(L_DEVICE.E2010B, 0)
+    volts = e2010.ConverterADC(adcpar, descr, on_overload=None)(raw)
+    assert abs(volts - codes * array([3.0, 1.0, 0.3])[gain][:, None] / 8000.0).max() < 1e-5
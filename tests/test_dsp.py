@@ -0,0 +1,49 @@
+"""Потоковая децимация в сравнении с прямой сверткой."""
+
+from __future__ import annotations
+
+import pytest
+from numpy import array, concatenate, convolve, float32, float64
+from numpy.random import default_rng
+
+from lcomp.dsp import Decimator, lowpass
+
+
+def test_lowpass_unity_gain() -> None:
+    assert abs(float(lowpass(8).sum()) - 1.0) < 1e-6
+
+
+@pytest.mark.parametrize("factors", [[1, 4, 400], [3, 3, 3]])
+def test_decimator_matches_convolve(factors: list[int]) -> None:
+    rng = default_rng(0)
+    x = rng.standard_normal((len(factors), 20000)).astype(float32)
+    decimator = Decimator(factors)
+
+    outputs: list[list] = [[] for _ in factors]
+    start = 0
+    while start < x.shape[1]:
+        size = int(rng.integers(1, 3000))
+        for channel, y in enumerate(decimator(x[:, start:start + size])):
+            outputs[channel].append(y.copy())
+        start += size
+
+    for channel, factor in enumerate(factors):
+        h = lowpass(factor) if factor > 1 else array([1.0])
+        reference = convolve(x[channel].astype(float64), h)[:x.shape[1]][factor - 1::factor]
+        result = concatenate(outputs[channel])
+        assert result.size == reference.size
+        assert abs(result - reference).max() < 1e-4
+
+
+def test_decimator_reset() -> None:
+    x = default_rng(1).standard_normal((2, 1000)).astype(float32)
+    decimator = Decimator(4, 2)
+    first = [y.copy() for y in decimator(x)]
+    decimator.reset()
+    second = decimator(x)
+    assert all((a == b).all() for a, b in zip(first, second))
+
+
+def test_decimator_rejects_channel_count() -> None:
+    with pytest.raises(ValueError):
+        Decimator(4, 2)(default_rng(2).standard_normal((3, 100)))
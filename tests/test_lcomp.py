@@ -0,0 +1,36 @@
+"""Обертка LCOMP над моделью плат."""
+
+from __future__ import annotations
+
+import pytest
+
+from lcomp.ioctl import L_USER_BASE
+from lcomp.lcomp import LCOMP
+
+MARKER = L_USER_BASE + 5
+
+
+def test_load_bios_marker() -> None:
+    with LCOMP(3) as ldev:          # E14-440
+        ldev.LoadBios("E440")
+        assert ldev.bios_loaded
+
+        ldev.LoadBios("E440", MARKER)
+        assert ldev.bios_loaded
+        ldev.LoadBios("E440", MARKER)
+        assert not ldev.bios_loaded
+        assert ldev.bios_time > 0
+
+        ldev.SetParameter(MARKER, 5)        # параметр затерт другой программой
+        ldev.LoadBios("E440", MARKER)
+        assert ldev.bios_loaded
+
+
+def test_load_bios_marker_rejected() -> None:
+    with LCOMP(3) as ldev:
+        with pytest.raises(ValueError):
+            ldev.LoadBios("E440", 7)
+
+    with LCOMP(2) as ldev:          # E20-10: PlataTest не проверяет ПЛИС
+        with pytest.raises(ValueError):
+            ldev.LoadBios("e2010", MARKER)
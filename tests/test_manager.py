@@ -0,0 +1,38 @@
+"""Одновременная работа с несколькими модулями."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from lcomp.manager import DeviceManager, DeviceSpec
+
+_ADC = {"IrqStep": 4096, "Pages": 16, "AutoInit": 1, "dRate": 200.0, "dKadr": 0.005,
+        "NCh": 2, "Chn": [0, 1]}
+
+
+def test_manager_streams() -> None:
+    specs = [DeviceSpec(slot, dict(_ADC)) for slot in range(4)]
+    with DeviceManager(specs) as manager:
+        manager.start()
+        assert {device.worker.name for device in manager.devices.values()} == \
+            {f"lcomp-worker-{slot}" for slot in range(4)}
+
+        received = dict.fromkeys(manager.devices, 0)
+
+        def drain(slot: int) -> None:
+            while (item := manager.devices[slot].worker.get(0.5)) is not None:
+                received[slot] += item[1].size
+
+        threads = [threading.Thread(target=drain, args=(slot,)) for slot in manager.devices]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.5)
+        manager.stop()
+        for thread in threads:
+            thread.join()
+
+        stats = manager.stats()
+        assert stats["lost"] == 0
+        assert stats["samples"] == sum(received.values()) > 0
+        assert all(item["samples"] > 0 for item in stats["devices"].values())
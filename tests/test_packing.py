@@ -0,0 +1,56 @@
+"""Упаковка кодов АЦП и файлы упакованных блоков."""
+
+from __future__ import annotations
+
+import pytest
+from numpy import arange, concatenate, int16, sin, stack
+from numpy.random import default_rng
+
+from lcomp.ioctl import L_DEVICE, WDAQ_PAR
+from lcomp.packing import (DELTA_ZLIB, PACKED, PackedReader, PackedRecorder, decode, encode, pack,
+                           packed_size, unpack)
+from lcomp.simulator import _plata_descr
+
+
+@pytest.mark.parametrize("bits", [12, 14])
+@pytest.mark.parametrize("count", [0, 1, 3, 7, 1001])
+def test_pack_round_trip(bits: int, count: int) -> None:
+    half = 1 << (bits - 1)
+    codes = default_rng(count).integers(-half, half, count).astype(int16)
+
+    packed = pack(codes, bits)
+    assert packed.size == packed_size(count, bits)
+    assert (unpack(packed, bits, count) == codes).all()
+
+
+@pytest.mark.parametrize("mode", [PACKED, DELTA_ZLIB])
+@pytest.mark.parametrize("bits", [12, 14])
+def test_encode_round_trip(mode: int, bits: int) -> None:
+    half = 1 << (bits - 1)
+    codes = default_rng(bits).integers(-half, half, 3 * 500 + 1).astype(int16)
+    marked = codes & int16((1 << bits) - 1) | int16(0x4000)     # лишний старший бит
+
+    block = encode(marked, bits, 3, mode)
+    decoded, offset = decode(block)
+    assert offset == len(block)
+    assert (decoded == codes).all()
+
+
+@pytest.mark.parametrize("mode", [PACKED, DELTA_ZLIB])
+def test_recorder_round_trip(tmp_path, mode: int) -> None:
+    t = arange(30000) / 1000
+    codes = (stack([sin(t), sin(t * 0.3), sin(t * 2)], 1) * 6000).astype(int16).ravel()
+    descr = _plata_descr(L_DEVICE.E140, 0)
+    adcpar = WDAQ_PAR().t3
+    adcpar.NCh = 3
+    adcpar.dRate = 100.0
+
+    filename = str(tmp_path / "codes.lpk")
+    with PackedRecorder(filename, adcpar, descr, L_DEVICE.E140, mode) as recorder:
+        for start in range(0, codes.size, 6553):
+            recorder.write(codes[start:start + 6553])
+
+    with PackedReader(filename) as reader:
+        assert reader.header.samples == codes.size
+        assert (concatenate(list(reader)) == codes).all()
+        assert concatenate(list(reader.volts()), axis=1).shape == (3, codes.size // 3)
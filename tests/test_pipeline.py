@@ -0,0 +1,68 @@
+"""Преобразование порций в пуле процессов."""
+
+from __future__ import annotations
+
+import pytest
+from numpy import concatenate, int16, sum as npsum
+from numpy.random import default_rng
+
+from lcomp.device import e140
+from lcomp.ioctl import L_DEVICE, WDAQ_PAR
+from lcomp.pipeline import ConversionPipeline
+from lcomp.simulator import _plata_descr
+
+
+def _setup(nch: int) -> tuple[object, object]:
+    adcpar = WDAQ_PAR().t3
+    adcpar.NCh = nch
+    adcpar.Chn[:nch] = list(range(nch))
+    return adcpar, _plata_descr(L_DEVICE.E140, 0)
+
+
+def _run(blocks: list, nch: int, block_size: int, slabs: int = 2) -> object:
+    adcpar, descr = _setup(nch)
+    with ConversionPipeline(e140.ConverterADC, adcpar, descr, block_size, slabs=slabs,
+                            processes=2) as pipeline:
+        return concatenate([volts.copy() for volts in pipeline.map(blocks)], axis=1)
+
+
+@pytest.mark.parametrize("slabs", [1, 2, 8])
+def test_pipeline_matches_converter(slabs: int) -> None:
+    adcpar, descr = _setup(4)
+    data = default_rng(1).integers(-8000, 8000, 4 * 10000, dtype=int16)
+    blocks = [data[i:i + 4001] for i in range(0, data.size, 4001)]     # неполные кадры на стыках
+
+    volts = _run(blocks, 4, 4096, slabs)
+    assert (volts == e140.ConverterADC(adcpar, descr)(data)).all()
+
+
+def test_pipeline_short_blocks() -> None:
+    adcpar, descr = _setup(4)
+    data = default_rng(4).integers(-8000, 8000, 4 * 100, dtype=int16)
+    sizes = [6, 1] * 57 + [1]        # блоки короче кадра вместе с остатком
+    bounds = [sum(sizes[:k]) for k in range(len(sizes) + 1)]
+    blocks = [data[start:stop] for start, stop in zip(bounds, bounds[1:])]
+
+    volts = _run(blocks, 4, 16)
+    assert volts.shape == (4, 100)
+    assert (volts == e140.ConverterADC(adcpar, descr)(data)).all()
+
+
+def test_pipeline_func() -> None:
+    adcpar, descr = _setup(2)
+    data = default_rng(2).integers(-8000, 8000, 2 * 3000, dtype=int16)
+    blocks = [data[i:i + 1000] for i in range(0, data.size, 1000)]
+
+    with ConversionPipeline(e140.ConverterADC, adcpar, descr, 1000, func=npsum,
+                            processes=2) as pipeline:
+        sums = list(pipeline.map(blocks))
+
+    reference = e140.ConverterADC(adcpar, descr)
+    assert sums == pytest.approx([float(npsum(reference(block))) for block in blocks], rel=1e-5)
+
+
+def test_pipeline_rejects_large_block() -> None:
+    adcpar, descr = _setup(2)
+    with ConversionPipeline(e140.ConverterADC, adcpar, descr, 100, processes=1) as pipeline:
+        with pytest.raises(ValueError):
+            list(pipeline.map([default_rng(3).integers(0, 10, 200, dtype=int16)]))
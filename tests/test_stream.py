@@ -0,0 +1,159 @@
+"""Потоковое чтение кольцевого буфера и фоновый поток сбора."""
+
+from __future__ import annotations
+
+import time
+
+from conftest import expected, setup_stream
+from numpy import concatenate, uint16
+
+from lcomp.stream import StreamReader, sample_rate
+from lcomp.worker import L_OVERRUN, AcquisitionWorker
+
+
+def test_sample_rate() -> None:
+    adcpar = type("Par", (), {"dRate": 100.0, "dKadr": 0.05, "NCh": 4})()
+    assert sample_rate(adcpar) == 4 * 1000.0 / (3 / 100.0 + 0.05)
+
+    adcpar.dKadr = 0.0
+    assert sample_rate(adcpar) == 100000.0
+
+
+def test_reader_continuous(ldev) -> None:
+    adcpar, address, syncd, size = setup_stream(ldev, size=65536, rate=200.0)
+    reader = StreamReader(adcpar, address, syncd, size, aligned=True)
+
+    ldev.InitStartLDevice()
+    ldev.StartLDevice()
+    chunks = []
+    deadline = time.perf_counter() + 0.5
+    for regions in reader:
+        assert all(region.size % reader.step == 0 for region in regions)
+        chunks.append(concatenate(regions).view(uint16))
+        if time.perf_counter() > deadline:
+            break
+    ldev.StopLDevice()
+
+    data = concatenate(chunks)
+    assert reader.lost == 0
+    assert data.size == reader.position > size
+    assert (data == expected(ldev, 0, data.size)).all()
+
+
+def test_reader_single_pass(ldev) -> None:
+    adcpar, address, syncd, size = setup_stream(ldev, size=16384, rate=400.0, autoinit=0)
+    reader = StreamReader(adcpar, address, syncd, size)
+
+    ldev.InitStartLDevice()
+    ldev.StartLDevice()
+    data = concatenate([concatenate(regions) for regions in reader]).view(uint16)
+    ldev.StopLDevice()
+
+    assert reader.finished
+    assert (data == expected(ldev, 0, size)).all()
+
+
+def test_reader_overrun(ldev) -> None:
+    adcpar, address, syncd, size = setup_stream(ldev, size=8192, rate=400.0)
+    reader = StreamReader(adcpar, address, syncd, size, aligned=True)
+
+    ldev.InitStartLDevice()
+    ldev.StartLDevice()
+    assert reader.wait_for(reader.step, timeout=1.0)
+    time.sleep(0.1)             # около пяти оборотов кольца
+    regions = reader.read()
+    ldev.StopLDevice()
+
+    assert reader.lost > size
+    assert reader.lost % reader.step == 0
+    index = reader.position - sum(region.size for region in regions)
+    assert index == reader.lost
+
+
+def test_reader_stopped(ldev) -> None:
+    adcpar, address, syncd, size = setup_stream(ldev, size=2048, rate=100.0, step=512)
+    reader = StreamReader(adcpar, address, syncd, size, aligned=True)
+
+    ldev.InitStartLDevice()
+    ldev.StartLDevice()
+    assert reader.wait_for(reader.step, timeout=1.0)
+    reader.read()
+    ldev.StopLDevice()
+    reader.available()
+
+    lost = reader.lost
+    time.sleep(0.5)             # около 25 оборотов кольца, если бы сбор шел
+    reader.available()
+    assert reader.lost == lost
+
+
+def test_wait_for_clamped(ldev) -> None:
+    adcpar, address, syncd, size = setup_stream(ldev, size=8192, rate=200.0)
+    reader = StreamReader(adcpar, address, syncd, size, aligned=True)
+
+    ldev.InitStartLDevice()
+    ldev.StartLDevice()
+    assert reader.wait_for(10 * size, timeout=1.0)
+    ldev.StopLDevice()
+
+
+def test_worker_order(ldev) -> None:
+    adcpar, address, syncd, size = setup_stream(ldev, nch=2, size=65536, rate=200.0)
+    reader = StreamReader(adcpar, address, syncd, size, aligned=True)
+    worker = AcquisitionWorker(reader, 4096, capacity=8, ldev=ldev)
+
+    worker.start()
+    position = 0
+    deadline = time.perf_counter() + 0.5
+    for index, block in worker:
+        assert index == position
+        assert (block.view(uint16) == expected(ldev, index, block.size)).all()
+        position = index + block.size
+        if time.perf_counter() > deadline:
+            break
+    worker.stop()
+
+    assert worker.error is None
+    assert worker.lost == 0
+    assert position > size
+
+
+def test_worker_slow_consumer(ldev) -> None:
+    adcpar, address, syncd, size = setup_stream(ldev, nch=3, size=8192, rate=100.0, step=1024)
+    reader = StreamReader(adcpar, address, syncd, size, aligned=True)
+    worker = AcquisitionWorker(reader, 4096, capacity=2, ldev=ldev)
+
+    worker.start()
+    position = blocks = 0
+    for index, block in worker:
+        assert index >= position
+        assert (block.view(uint16) == expected(ldev, index, block.size)).all()
+        position = index + block.size
+        blocks += 1
+        if blocks == 8:
+            break
+        time.sleep(0.2)
+    worker.stop()
+
+    assert worker.error is None
+    assert worker.overrun > 0
+    assert worker.samples + worker.overrun >= position
+
+
+def test_worker_drop_newest(ldev) -> None:
+    adcpar, address, syncd, size = setup_stream(ldev, nch=2, size=65536, rate=400.0)
+    reader = StreamReader(adcpar, address, syncd, size, aligned=True)
+    worker = AcquisitionWorker(reader, 4096, capacity=2, policy=L_OVERRUN.DROP_NEWEST,
+                               ldev=ldev)
+
+    worker.start()
+    time.sleep(0.2)
+    received = 0
+    while (item := worker.get(timeout=0)) is not None:
+        index, block = item
+        assert (block.view(uint16) == expected(ldev, index, block.size)).all()
+        received += block.size
+    worker.stop()
+
+    assert worker.dropped > 0
+    assert worker.samples == received + worker.pending * 4096